@@ -15,7 +15,7 @@ import argparse
 import sys
 import random
 from connect4 import Connect4
-from mcts import MCTSPlayer  
+from mcts import MCTSPlayer, RootParallelMCTSPlayer, TreeParallelMCTSPlayer
 from minimax import MinimaxPlayer
 
 def benchmark_algorithm(player, opponent, games=20, name="Algorithm"):
@@ -175,6 +175,34 @@ def run_quick_benchmark():
             strength = "Strong" if result['win_rate'] > 0.8 else "Medium" if result['win_rate'] > 0.6 else "Weak"
             print(f"{result['name']:<12} {result['win_rate']:<10.1%} {result['avg_move_time']:<10.3f} {strength}")
 
+def benchmark_parallel_scaling(simulations=2000, worker_counts=(1, 2, 4)):
+    """Compare simulations per second of the parallel MCTS players with the serial one."""
+    
+    print("MCTS Parallel Scaling")
+    print("=" * 50)
+    
+    def rate(player, total_simulations):
+        player.get_move(Connect4(), 1)  # warm up worker processes
+        start = time.time()
+        player.get_move(Connect4(), 1)
+        return total_simulations / (time.time() - start)
+    
+    serial_rate = rate(MCTSPlayer(simulations=simulations), simulations)
+    print(f"{'Player':<22} {'Workers':<8} {'Sims/s':<10} {'Speedup':<8} {'Efficiency'}")
+    print("-" * 60)
+    print(f"{'Serial':<22} {1:<8} {serial_rate:<10.0f} {1.0:<8.2f} {1.0:.0%}")
+    
+    for workers in worker_counts:
+        for name, player, total in [
+            ("Root-parallel", RootParallelMCTSPlayer(simulations=simulations, workers=workers), simulations * workers),
+            ("Tree-parallel (VL=1)", TreeParallelMCTSPlayer(simulations=simulations, workers=workers), simulations),
+        ]:
+            try:
+                speedup = rate(player, total) / serial_rate
+            finally:
+                player.close()
+            print(f"{name:<22} {workers:<8} {speedup * serial_rate:<10.0f} {speedup:<8.2f} {speedup / workers:.0%}")
+
 def main():
     """Main benchmark function with argument parsing."""
     
@@ -183,19 +211,26 @@ def main():
     parser.add_argument('--mcts-sims', type=int, default=200, help='MCTS simulations')
     parser.add_argument('--minimax-depth', type=int, default=4, help='Minimax search depth')
     parser.add_argument('--quick', action='store_true', help='Run quick benchmark suite')
+    parser.add_argument('--parallel-scaling', action='store_true', help='Measure parallel MCTS scaling')
+    parser.add_argument('--time-limit', type=float, default=None,
+                        help='Seconds per move for both engines (overrides --mcts-sims and --minimax-depth)')
     
     args = parser.parse_args()
     
     if args.quick:
         run_quick_benchmark()
+    elif args.parallel_scaling:
+        benchmark_parallel_scaling(simulations=args.mcts_sims * 10)
     else:
         # Custom benchmark
         print(f"Custom Benchmark: MCTS-{args.mcts_sims} vs Minimax-{args.minimax_depth}")
+        if args.time_limit is not None:
+            print(f"Both engines limited to {args.time_limit}s per move")
         print(f"Games: {args.games}")
         print("=" * 60)
         
-        mcts_player = MCTSPlayer(simulations=args.mcts_sims)
-        minimax_player = MinimaxPlayer(depth=args.minimax_depth)
+        mcts_player = MCTSPlayer(simulations=args.mcts_sims, time_limit=args.time_limit)
+        minimax_player = MinimaxPlayer(depth=args.minimax_depth, time_limit=args.time_limit)
         
         # MCTS vs Minimax
         mcts_result = benchmark_algorithm(
@@ -0,0 +1,223 @@
+import numpy as np
+from functools import lru_cache
+from connect4 import Connect4, THREE_IN_ROW, TWO_IN_ROW, get_window_tables, get_zobrist_keys
+
+
+@lru_cache(maxsize=None)
+def _bit_masks(rows, cols):
+    """
+    Precompute the bit masks used by BitboardConnect4 for a board geometry.
+
+    Each column uses rows+1 bits (the extra bit is a sentinel that keeps
+    shifted alignments from wrapping into the next column). Bit index for
+    column c at height h (h=0 is the bottom row) is c*(rows+1) + h.
+
+    Returns:
+        (window_masks, column_masks, top_mask, shifts, cell_line_masks)
+        where cell_line_masks[cell] holds the masks of every four-in-a-row
+        line through cell (row * cols + col)
+    """
+    h1 = rows + 1
+    def bit(cell):
+        row, col = divmod(cell, cols)
+        return 1 << (col * h1 + (rows - 1 - row))
+    tables = get_window_tables(rows, cols)
+    window_masks = tuple(sum(bit(cell) for cell in window) for window in tables.windows)
+    cell_line_masks = tuple(tuple(sum(bit(cell) for cell in line) for line in lines)
+                            for lines in tables.cell_lines)
+    column_masks = tuple(((1 << rows) - 1) << (col * h1) for col in range(cols))
+    top_mask = sum(bit(col) for col in range(cols))
+    # vertical, horizontal, and the two diagonals
+    shifts = (1, h1, h1 + 1, h1 - 1)
+    return window_masks, column_masks, top_mask, shifts, cell_line_masks
+
+
+class BitboardConnect4:
+    """
+    Connect4 state backed by two integer bitboards and per-column heights.
+
+    Exposes the same methods as Connect4 so MinimaxPlayer and MCTSPlayer can
+    run on it unchanged. Moves and undos are O(1) and four-in-a-row detection
+    is a handful of shift-and-mask operations.
+    """
+    def __init__(self, rows=6, cols=7):
+        self.rows = rows
+        self.cols = cols
+        self.bitboards = [0, 0]
+        self.heights = [0] * cols
+        self.current_player = 1
+        (self._window_masks, self._column_masks, self._top_mask, self._shifts,
+         self._cell_line_masks) = _bit_masks(rows, cols)
+        # Zobrist hashes, with the same keys (and values) as Connect4
+        self._zobrist, self._mirror_zobrist = get_zobrist_keys(rows, cols)
+        self.hash = 0
+        self.mirror_hash = 0
+
+    def __getstate__(self):
+        # shared per-size tables are rebuilt on unpickling
+        return {'rows': self.rows, 'cols': self.cols, 'bitboards': self.bitboards, 'heights': self.heights,
+                'current_player': self.current_player, 'hash': self.hash, 'mirror_hash': self.mirror_hash}
+
+    def __setstate__(self, state):
+        self.__init__(state['rows'], state['cols'])
+        self.__dict__.update(state)
+
+    @classmethod
+    def from_connect4(cls, game):
+        """Build a bitboard state from an array-backed Connect4 game"""
+        new_game = cls(game.rows, game.cols)
+        for col in range(game.cols):
+            for row in range(game.rows - 1, -1, -1):
+                piece = game.board[row][col]
+                if piece == 0:
+                    break
+                new_game._place(row, col, piece)
+        new_game.current_player = game.current_player
+        return new_game
+
+    @property
+    def board(self):
+        """
+        NumPy (rows, cols) array of the position, for drawing and printing.
+
+        Read-only: the array is rebuilt from the bitboards on every access,
+        so writing to it does not change the game. Use drop_piece or
+        simulate_move instead.
+        """
+        board = np.zeros((self.rows, self.cols), dtype=int)
+        h1 = self.rows + 1
+        for player in (1, 2):
+            bits = self.bitboards[player - 1]
+            for col in range(self.cols):
+                for h in range(self.heights[col]):
+                    if bits >> (col * h1 + h) & 1:
+                        board[self.rows - 1 - h][col] = player
+        return board
+
+    def _bit(self, row, col):
+        return 1 << (col * (self.rows + 1) + (self.rows - 1 - row))
+
+    def _place(self, row, col, player):
+        self.bitboards[player - 1] |= self._bit(row, col)
+        self.heights[col] = max(self.heights[col], self.rows - row)
+        cell = row * self.cols + col
+        self.hash ^= self._zobrist[player][cell]
+        self.mirror_hash ^= self._mirror_zobrist[player][cell]
+
+    def _has_four(self, bits):
+        for shift in self._shifts:
+            pairs = bits & (bits >> shift)
+            if pairs & (pairs >> (2 * shift)):
+                return True
+        return False
+
+    def drop_piece(self, row, col):
+        self._place(row, col, self.current_player)
+
+    def switch_player(self):
+        self.current_player = 3 - self.current_player
+
+    def is_valid_location(self, col):
+        return self.heights[col] < self.rows
+
+    def get_next_open_row(self, col):
+        if self.heights[col] < self.rows:
+            return self.rows - 1 - self.heights[col]
+        return None
+
+    def is_winning_move(self, row, col):
+        """Whether the current player has four in a row through (row, col)"""
+        bits = self.bitboards[self.current_player - 1]
+        for mask in self._cell_line_masks[row * self.cols + col]:
+            if bits & mask == mask:
+                return True
+        return False
+
+    def get_game_state(self):
+        """
+        Returns:
+        0 = game ongoing
+        1 = player 1 wins
+        2 = player 2 wins
+        3 = draw
+        """
+        if self._has_four(self.bitboards[0]):
+            return 1
+        if self._has_four(self.bitboards[1]):
+            return 2
+        if (self.bitboards[0] | self.bitboards[1]) & self._top_mask == self._top_mask:
+            return 3
+        return 0
+
+    def evaluate_position(self, player):
+        """
+        Evaluate the current board position for the given player.
+        Returns: int (higher = better for player), identical to Connect4
+        """
+        game_state = self.get_game_state()
+        if game_state == player:
+            return 1000
+        elif game_state == 3 - player:
+            return -1000
+        elif game_state == 3:
+            return 0
+        own = self.bitboards[player - 1]
+        other = self.bitboards[2 - player]
+        score = 0
+        for window in self._window_masks:
+            own_count = (own & window).bit_count()
+            other_count = (other & window).bit_count()
+            if other_count == 0:
+                if own_count == 3:
+                    score += THREE_IN_ROW
+                elif own_count == 2:
+                    score += TWO_IN_ROW
+            elif own_count == 0:
+                if other_count == 3:
+                    score -= THREE_IN_ROW
+                elif other_count == 2:
+                    score -= TWO_IN_ROW
+        for col, weight in enumerate(get_window_tables(self.rows, self.cols).center_weights):
+            if weight > 0:
+                score += weight * (own & self._column_masks[col]).bit_count()
+        return score
+
+    evaluate_window = Connect4.evaluate_window
+
+    def get_valid_moves(self):
+        """Return list of valid column numbers where pieces can be dropped"""
+        return [col for col in range(self.cols) if self.heights[col] < self.rows]
+
+    def copy_game(self):
+        """Create a copy of the game state"""
+        new_game = BitboardConnect4(self.rows, self.cols)
+        new_game.bitboards = self.bitboards[:]
+        new_game.heights = self.heights[:]
+        new_game.current_player = self.current_player
+        new_game.hash = self.hash
+        new_game.mirror_hash = self.mirror_hash
+        return new_game
+
+    def simulate_move(self, col, player):
+        """Make a move and return undo information. Assumes col is valid."""
+        h = self.heights[col]
+        self.bitboards[player - 1] |= 1 << (col * (self.rows + 1) + h)
+        self.heights[col] = h + 1
+        cell = (self.rows - 1 - h) * self.cols + col
+        self.hash ^= self._zobrist[player][cell]
+        self.mirror_hash ^= self._mirror_zobrist[player][cell]
+        return (self.rows - 1 - h, col)
+
+    def undo_move(self, undo_info):
+        """Undo a move using the undo information"""
+        row, col = undo_info
+        bit = self._bit(row, col)
+        player = 1 if self.bitboards[0] & bit else 2
+        cell = row * self.cols + col
+        self.hash ^= self._zobrist[player][cell]
+        self.mirror_hash ^= self._mirror_zobrist[player][cell]
+        self.bitboards[player - 1] &= ~bit
+        self.heights[col] = self.rows - 1 - row
+
+    draw_board = Connect4.draw_board
+    print_board = Connect4.print_board
@@ -1,16 +1,198 @@
 import numpy as np
 import pygame as pg
+import random
+from functools import lru_cache
 THREE_IN_ROW = 100    
 TWO_IN_ROW = 10       
 CENTER_BONUS = 3
+# WINDOW_VALUES[n1][n2]: evaluate_window score for player 1 of a window
+# holding n1 player-1 pieces and n2 player-2 pieces (negate for player 2)
+WINDOW_VALUES = [[0] * 5 for _ in range(5)]
+for _n in (2, 3):
+    WINDOW_VALUES[_n][0] = THREE_IN_ROW if _n == 3 else TWO_IN_ROW
+    WINDOW_VALUES[0][_n] = -WINDOW_VALUES[_n][0]
+WINDOW_VALUE_TABLE = np.array(WINDOW_VALUES)
+
+class WindowTables:
+    """
+    Precomputed 4-cell windows for one board geometry.
+
+    Cells are addressed by flat index row*cols + col.
+
+    Attributes:
+        lines: every four-in-a-row line, used for win detection
+        windows: the windows scored by evaluate_position (the evaluation
+            only scores horizontal windows in the top rows-3 rows)
+        cell_lines: for each cell, the lines that contain it
+        cell_windows: for each cell, the indices of windows that contain it
+        center_weights: center bonus for a piece in each column
+        window_index: (n_windows, 4) array of windows, for gathering from a
+            flattened board
+        line_index: (n_lines, 4) array of lines
+        cell_line_index: (n_cells, max_lines, 4) array of the lines through
+            each cell, padded with lines of the sentinel cell rows*cols
+            (gather from boards with one extra always-empty cell)
+        cell_weights: center bonus for a piece on each cell
+    """
+    def __init__(self, rows, cols):
+        def flat(row, col):
+            return row * cols + col
+        horizontal = lambda max_row: [tuple(flat(row, col + i) for i in range(4))
+                                      for row in range(max_row) for col in range(cols - 3)]
+        vertical = [tuple(flat(row + i, col) for i in range(4))
+                    for col in range(cols) for row in range(rows - 3)]
+        positive = [tuple(flat(row + i, col + i) for i in range(4))
+                    for row in range(rows - 3) for col in range(cols - 3)]
+        negative = [tuple(flat(row - i, col + i) for i in range(4))
+                    for row in range(3, rows) for col in range(cols - 3)]
+        self.lines = tuple(horizontal(rows) + vertical + positive + negative)
+        self.windows = tuple(horizontal(rows - 3) + vertical + positive + negative)
+        self.cell_lines = tuple(tuple(line for line in self.lines if cell in line)
+                                for cell in range(rows * cols))
+        self.cell_windows = tuple(tuple(index for index, window in enumerate(self.windows) if cell in window)
+                                  for cell in range(rows * cols))
+        center_col = cols // 2
+        self.center_weights = tuple(max(0, CENTER_BONUS - abs(col - center_col)) for col in range(cols))
+        self.window_index = np.array(self.windows, dtype=np.intp).reshape(-1, 4)
+        self.line_index = np.array(self.lines, dtype=np.intp).reshape(-1, 4)
+        max_lines = max(len(lines) for lines in self.cell_lines)
+        sentinel = (rows * cols,) * 4
+        self.cell_line_index = np.array([list(lines) + [sentinel] * (max_lines - len(lines))
+                                         for lines in self.cell_lines], dtype=np.intp).reshape(rows * cols, -1, 4)
+        self.cell_weights = np.tile(np.array(self.center_weights), rows)
+
+@lru_cache(maxsize=None)
+def get_window_tables(rows, cols):
+    """Return the WindowTables shared by every board of this size"""
+    return WindowTables(rows, cols)
+
+@lru_cache(maxsize=None)
+def get_zobrist_keys(rows, cols, seed=20240101):
+    """
+    Return the 64-bit Zobrist keys shared by every board of this size.
+
+    Returns:
+        (keys, mirror_keys): keys[player][cell] is the key for a piece of
+        player on flat cell row*cols + col (keys[0] is unused), and
+        mirror_keys[player][cell] is the key of the left-right reflected cell
+    """
+    rng = random.Random(seed)
+    keys = tuple(tuple(rng.getrandbits(64) if player else 0 for _ in range(rows * cols))
+                 for player in range(3))
+    mirror_keys = tuple(tuple(player_keys[row * cols + (cols - 1 - col)]
+                              for row in range(rows) for col in range(cols))
+                        for player_keys in keys)
+    return keys, mirror_keys
+
+def _stack_boards(boards):
+    """Stack boards into an (N, rows, cols) array; accepts games with a .board too"""
+    if len(boards) and hasattr(boards[0], 'board'):
+        boards = [game.board for game in boards]
+    boards = np.asarray(boards)
+    if boards.ndim != 3:
+        raise ValueError(f"Expected an (N, rows, cols) stack of boards, got shape {boards.shape}")
+    return boards
+
+def get_game_states(boards):
+    """
+    Compute get_game_state() for many boards in one vectorized call.
+
+    Args:
+        boards: (N, rows, cols) array, or a sequence of Connect4 /
+            BitboardConnect4 games
+
+    Returns:
+        (N,) int array of game states (0 ongoing, 1/2 winner, 3 draw)
+    """
+    boards = _stack_boards(boards)
+    n, rows, cols = boards.shape
+    cells = boards.reshape(n, rows * cols)
+    lines = cells[:, get_window_tables(rows, cols).line_index]
+    complete = (lines[:, :, 0] != 0) & (lines == lines[:, :, :1]).all(axis=2)
+    # same winner as the scalar scan: the first complete line in table order
+    first = complete.argmax(axis=1)
+    winners = lines[np.arange(n), first, 0]
+    full = (boards[:, 0, :] != 0).all(axis=1)
+    return np.where(complete.any(axis=1), winners, np.where(full, 3, 0))
+
+def evaluate_boards(boards, player):
+    """
+    Evaluate many positions for player in one vectorized call.
+
+    Args:
+        boards: (N, rows, cols) array, or a sequence of Connect4 /
+            BitboardConnect4 games
+        player: player to score for (1 or 2)
+
+    Returns:
+        (scores, game_states): two (N,) int arrays; scores match
+        Connect4.evaluate_position for each board
+    """
+    boards = _stack_boards(boards)
+    n, rows, cols = boards.shape
+    tables = get_window_tables(rows, cols)
+    cells = boards.reshape(n, rows * cols)
+    states = get_game_states(boards)
+    windows = cells[:, tables.window_index]
+    counts1 = np.count_nonzero(windows == 1, axis=2)
+    counts2 = np.count_nonzero(windows == 2, axis=2)
+    scores = WINDOW_VALUE_TABLE[counts1, counts2].sum(axis=1)
+    if player == 2:
+        scores = -scores
+    scores = scores + ((cells == player) * tables.cell_weights).sum(axis=1)
+    scores = np.where(states == player, 1000, scores)
+    scores = np.where(states == 3 - player, -1000, scores)
+    scores = np.where(states == 3, 0, scores)
+    return scores, states
+
 class Connect4:
     def __init__(self, rows=6, cols=7):
         self.rows = rows
         self.cols = cols
         self.board = np.zeros((rows, cols), dtype=int)
         self.current_player = 1
+        self._tables = get_window_tables(rows, cols)
+        # Zobrist hash of the position and of its left-right reflection
+        self._zobrist, self._mirror_zobrist = get_zobrist_keys(rows, cols)
+        self.hash = 0
+        self.mirror_hash = 0
+        # cached get_game_state() result (None = unknown), with the values
+        # saved by simulate_move so undo_move can restore them
+        self._status = 0
+        self._status_stack = []
+        # incremental evaluation state, built by the first evaluate_position
+        self._window_counts = None
+    def __getstate__(self):
+        # shared per-size tables and the evaluation cache are rebuilt on
+        # unpickling, which keeps games cheap to send to worker processes
+        state = self.__dict__.copy()
+        for name in ('_tables', '_zobrist', '_mirror_zobrist'):
+            state.pop(name, None)
+        state['_window_counts'] = None
+        return state
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._tables = get_window_tables(self.rows, self.cols)
+        self._zobrist, self._mirror_zobrist = get_zobrist_keys(self.rows, self.cols)
     def drop_piece(self,row,col):
-        self.board[row][col] = self.current_player
+        self._place(row, col, self.current_player)
+        # earlier simulate_move calls can no longer be undone to a known status
+        self._status_stack.clear()
+    def _place(self, row, col, player):
+        """Put a piece on the board and update the cached game state from it"""
+        previous = self.board[row][col]
+        self.board[row][col] = player
+        cell = row * self.cols + col
+        self.hash ^= self._zobrist[previous][cell] ^ self._zobrist[player][cell]
+        self.mirror_hash ^= self._mirror_zobrist[previous][cell] ^ self._mirror_zobrist[player][cell]
+        if self._window_counts is not None:
+            self._update_evaluation(row, col, previous, player)
+        if self._status != 0 or previous != 0:
+            self._status = None
+        elif self._is_win_at(row, col, player):
+            self._status = player
+        elif row == 0 and all(self.board[0][c] != 0 for c in range(self.cols)):
+            self._status = 3
 
     def switch_player(self):
         self.current_player = 3 - self.current_player
@@ -23,23 +205,12 @@ class Connect4:
         return None
 
     def is_winning_move(self, row, col):
-        # check horizontal
-        for c in range(max(0, col-3), min(self.cols-3, col+1)):
-            if all(self.board[row][c+i] == self.current_player for i in range(4)):
-                return True
-        # check vertical
-        for r in range(max(0, row-3), min(self.rows-3, row+1)):
-            if all(self.board[r+i][col] == self.current_player for i in range(4)):
-                return True
-        # check positive diagonal
-        for r, c in zip(range(max(0, row-3), min(self.rows-3, row+1)),
-                        range(max(0, col-3), min(self.cols-3, col+1))):
-            if all(self.board[r+i][c+i] == self.current_player for i in range(4)):
-                return True
-        # check negative diagonal
-        for r, c in zip(range(max(0, row-3), min(self.rows-3, row+1)),
-                        range(min(self.cols-1, col+3), max(-1, col-4), -1)):
-            if all(self.board[r+i][c-i] == self.current_player for i in range(4)):
+        return self._is_win_at(row, col, self.current_player)
+    def _is_win_at(self, row, col, player):
+        """Check for four in a row through (row, col) for player"""
+        cells = self.board.ravel().tolist()
+        for a, b, c, d in self._tables.cell_lines[row * self.cols + col]:
+            if cells[a] == player and cells[b] == player and cells[c] == player and cells[d] == player:
                 return True
         return False
     def get_game_state(self):
@@ -50,31 +221,17 @@ class Connect4:
         2 = player 2 wins
         3 = draw
         """
-        # Check for wins by scanning the entire board
-        for row in range(self.rows):
-            for col in range(self.cols):
-                if self.board[row][col] != 0:  
-                    player = self.board[row][col]
-                    
-                    # Check horizontal (right)
-                    if col <= self.cols - 4:
-                        if all(self.board[row][col + i] == player for i in range(4)):
-                            return player
-                    
-                    # Check vertical (down)
-                    if row <= self.rows - 4:
-                        if all(self.board[row + i][col] == player for i in range(4)):
-                            return player
-                    
-                    # Check positive diagonal (down-right)
-                    if row <= self.rows - 4 and col <= self.cols - 4:
-                        if all(self.board[row + i][col + i] == player for i in range(4)):
-                            return player
-                    
-                    # Check negative diagonal (down-left)
-                    if row <= self.rows - 4 and col >= 3:
-                        if all(self.board[row + i][col - i] == player for i in range(4)):
-                            return player
+        if self._status is None:
+            self._status = self._scan_game_state()
+        return self._status
+    def _scan_game_state(self):
+        """Compute get_game_state() from scratch"""
+        # Check for wins by scanning every line
+        cells = self.board.ravel().tolist()
+        for a, b, c, d in self._tables.lines:
+            player = cells[a]
+            if player != 0 and cells[b] == player and cells[c] == player and cells[d] == player:
+                return player
         
         # Check for draw (top row full)
         if all(self.board[0][col] != 0 for col in range(self.cols)):
@@ -86,8 +243,64 @@ class Connect4:
         """
         Evaluate the current board position for the given player.
         Returns: int/float (higher = better for player)
+
+        Window counts and the running score are kept up to date by every
+        move once this has been called, so a leaf evaluation only pays for
+        the windows touching the cells changed since the last one.
+        """
+        game_state=self.get_game_state()
+        if game_state==player:
+            return 1000
+        elif game_state==3-player:
+            return -1000
+        elif game_state==3:
+            return 0
+        if self._window_counts is None:
+            self._init_evaluation()
+        score = self._window_score if player == 1 else -self._window_score
+        return score + self._center_bonus[player]
+    def _init_evaluation(self):
+        """Build the per-window piece counts from the board"""
+        self._window_counts = [[0, 0, 0] for _ in self._tables.windows]
+        self._window_score = 0
+        self._center_bonus = [0, 0, 0]
+        for cell, piece in enumerate(self.board.ravel().tolist()):
+            if piece != 0:
+                self._update_evaluation(cell // self.cols, cell % self.cols, 0, piece)
+    def _update_evaluation(self, row, col, previous, piece):
+        """Move the window counts and score for (row, col) going from previous to piece"""
+        for index in self._tables.cell_windows[row * self.cols + col]:
+            counts = self._window_counts[index]
+            self._window_score -= WINDOW_VALUES[counts[1]][counts[2]]
+            counts[previous] -= 1
+            counts[piece] += 1
+            self._window_score += WINDOW_VALUES[counts[1]][counts[2]]
+        weight = self._tables.center_weights[col]
+        self._center_bonus[previous] -= weight
+        self._center_bonus[piece] += weight
+    def evaluate_position_vectorized(self, player):
+        """
+        Evaluate the position like evaluate_position, but score every window
+        in one NumPy operation instead of through Python loops.
         """
         game_state=self.get_game_state()
+        if game_state==player:
+            return 1000
+        elif game_state==3-player:
+            return -1000
+        elif game_state==3:
+            return 0
+        cells = self.board.ravel()
+        windows = cells[self._tables.window_index]
+        counts1 = np.count_nonzero(windows == 1, axis=1)
+        counts2 = np.count_nonzero(windows == 2, axis=1)
+        score = int(WINDOW_VALUE_TABLE[counts1, counts2].sum())
+        if player == 2:
+            score = -score
+        return score + int(self._tables.cell_weights[cells == player].sum())
+    def _scan_evaluate_position(self, player):
+        """Compute evaluate_position() from scratch"""
+        game_state=self.get_game_state()
         if game_state==player:
             return 1000
         elif game_state==3-player:
@@ -95,31 +308,15 @@ class Connect4:
         elif game_state==3:
             return 0
         else :
+            cells = self.board.ravel().tolist()
             score = 0
-            for row in range(self.rows-3):
-                for col in range(self.cols-3):
-                        window = [self.board[row][col + i] for i in range(4)]
-                        score+=self.evaluate_window(window,player)
-            for col in range(self.cols):
-                for row in range(self.rows - 3):  
-                        window = [self.board[row + i][col] for i in range(4)]
-                        score+=self.evaluate_window(window,player)
-            for row in range(self.rows - 3):
-                for col in range(self.cols - 3):
-                        window = [self.board[row + i][col + i] for i in range(4)]
-                        score+=self.evaluate_window(window,player)
-            for row in range(3, self.rows):  
-                for col in range(self.cols - 3):
-                        window = [self.board[row - i][col + i] for i in range(4)]
-                        score+=self.evaluate_window(window,player)
+            for window in self._tables.windows:
+                score += self.evaluate_window([cells[i] for i in window], player)
             #add central position bonus
-            bonus=0
-            center_col= self.cols//2
-            for row in range(self.rows):
-                for col in range(self.cols):
-                    if self.board[row][col]==player:
-                        distance_from_center=abs(col-center_col)
-                        bonus+=max(0,CENTER_BONUS-distance_from_center)
+            bonus = 0
+            for cell, piece in enumerate(cells):
+                if piece == player:
+                    bonus += self._tables.center_weights[cell % self.cols]
             return score+bonus
  
         
@@ -148,18 +345,29 @@ class Connect4:
         new_game = Connect4(self.rows, self.cols)
         new_game.board = np.copy(self.board)
         new_game.current_player = self.current_player
+        new_game._status = self._status
+        new_game.hash = self.hash
+        new_game.mirror_hash = self.mirror_hash
         return new_game
         
     def simulate_move(self, col, player):
         """Make a move and return undo information. Assumes col is valid."""
         row = self.get_next_open_row(col)
-        self.board[row][col] = player
+        self._status_stack.append(self._status)
+        self._place(row, col, player)
         return (row, col)  
     
     def undo_move(self, undo_info):
         """Undo a move using the undo information"""
         row, col = undo_info
+        previous = self.board[row][col]
+        cell = row * self.cols + col
+        self.hash ^= self._zobrist[previous][cell]
+        self.mirror_hash ^= self._mirror_zobrist[previous][cell]
+        if self._window_counts is not None:
+            self._update_evaluation(row, col, previous, 0)
         self.board[row][col] = 0
+        self._status = self._status_stack.pop() if self._status_stack else None
 
     def draw_board(self, screen, square_size):
         blue = (0, 0, 255)
@@ -167,12 +375,13 @@ class Connect4:
         red = (255, 0, 0)
         yellow = (255, 255, 0)
         radius = int(square_size / 2 - 5)
+        board = self.board  # read once: BitboardConnect4 builds it on access
         for c in range(self.cols):
             for r in range(self.rows):
                 pg.draw.rect(screen, blue, (c * square_size, r * square_size + square_size, square_size, square_size))
-                if self.board[r][c] == 0:
+                if board[r][c] == 0:
                     pg.draw.circle(screen, black, (int(c * square_size + square_size / 2), int(r * square_size + square_size + square_size / 2)), radius)
-                elif self.board[r][c] == 1:
+                elif board[r][c] == 1:
                     pg.draw.circle(screen, red, (int(c * square_size + square_size / 2), int(r * square_size + square_size + square_size / 2)), radius)
                 else:
                     pg.draw.circle(screen, yellow, (int(c * square_size + square_size / 2), int(r * square_size + square_size + square_size / 2)), radius)
@@ -181,12 +390,13 @@ class Connect4:
         """Print the board in a human-readable format"""
         print("  " + " ".join(str(i) for i in range(self.cols)))
         print("  " + "-" * (self.cols * 2 - 1))  
+        board = self.board
         for row in range(self.rows):
             row_str = "| "
             for col in range(self.cols):
-                if self.board[row][col] == 0:
+                if board[row][col] == 0:
                     row_str += ". "  
-                elif self.board[row][col] == 1:
+                elif board[row][col] == 1:
                     row_str += "1 "  
                 else:
                     row_str += "2 "  
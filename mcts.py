@@ -1,6 +1,79 @@
 import math
 import random
-from connect4 import Connect4
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from connect4 import Connect4, get_window_tables
+
+def random_rollout(state, player, moves=None):
+    """
+    Play uniformly random moves from state, player to move, until the game
+    ends. The moves are undone before returning the game result.
+
+    If moves is a list, the ((row, col), player) pairs played are appended to it.
+    """
+    played = []
+    while state.get_game_state() == 0:
+        valid_moves = state.get_valid_moves()
+        if not valid_moves:
+            break
+        played.append(state.simulate_move(random.choice(valid_moves), player))
+        if moves is not None:
+            moves.append((played[-1], player))
+        player = 3 - player
+    result = state.get_game_state()
+    while played:
+        state.undo_move(played.pop())
+    return result
+
+def batch_rollout(state, player, count, rng=None):
+    """
+    Play count random games from state, player to move, at once as NumPy
+    array operations.
+
+    rng is the np.random.Generator to draw from; by default a new one is
+    seeded from the random module, so random.seed makes the games
+    reproducible like the other rollouts.
+
+    Returns:
+        int array of length 4: number of games ending in each game state
+        (index 1 = player 1 wins, 2 = player 2 wins, 3 = draw)
+    """
+    start = state.get_game_state()
+    if start != 0:
+        outcomes = np.zeros(4, dtype=int)
+        outcomes[start] = count
+        return outcomes
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+    rows, cols = state.rows, state.cols
+    cell_lines = get_window_tables(rows, cols).cell_line_index
+    board = np.asarray(state.board)
+    # flattened boards plus one always-empty sentinel cell for padded lines
+    boards = np.zeros((count, rows * cols + 1), dtype=np.int8)
+    boards[:, :-1] = board.ravel()
+    heights = np.repeat((board != 0).sum(axis=0)[np.newaxis], count, axis=0)
+    results = np.zeros(count, dtype=int)
+    turn = np.full(count, player, dtype=np.int8)
+    games = np.arange(count)
+    while len(games):
+        n = len(games)
+        # uniform choice among open columns: argmax of random keys, full columns masked out
+        keys = rng.random((n, cols))
+        keys[heights[games] >= rows] = -1.0
+        col = keys.argmax(axis=1)
+        cell = (rows - 1 - heights[games, col]) * cols + col
+        movers = turn[games]
+        boards[games, cell] = movers
+        heights[games, col] += 1
+        lines = boards[games[:, np.newaxis, np.newaxis], cell_lines[cell]]
+        won = (lines == movers[:, np.newaxis, np.newaxis]).all(axis=2).any(axis=1)
+        full = (heights[games] >= rows).all(axis=1)
+        results[games[won]] = movers[won]
+        results[games[full & ~won]] = 3
+        turn[games] = 3 - movers
+        games = games[~(won | full)]
+    return np.bincount(results, minlength=4)
 
 class Node:
     def __init__(self, game_state, move=None, parent=None, player_who_moved=None):
@@ -8,21 +81,46 @@ class Node:
         MCTS Node representing a game state
         
         Args:
-            game_state: Connect4 game at this state
+            game_state: Connect4 game at this state. Only a root node keeps
+                a copy; other nodes store just their move and are reached
+                by replaying moves from the root (see game_state)
             move: The move that led to this state (column number)
-            parent: Parent node in the tree
+            parent: Parent node in the tree (the first parent, when nodes
+                are shared between parents in a transposition DAG)
             player_who_moved: Player who made the move to reach this state
         """
-        self.game_state = game_state.copy_game()  
+        self.root_state = game_state.copy_game() if parent is None else None
         self.move = move              
+        self.cell = None              # (row, col) filled by move, set on expansion
         self.parent = parent         
         self.player_who_moved = player_who_moved  
         
         # MCTS statistics
         self.visits = 0               
         self.wins = 0                 
+        self.virtual_loss = 0         # pending visits of in-flight parallel simulations
+        self.rave_visits = 0          # all-moves-as-first statistics for this move
+        self.rave_wins = 0
         self.children = []            
-        self.untried_moves = self.game_state.get_valid_moves() 
+        self.transposed_moves = None  # child -> (move, cell) for children first reached from another parent
+        self.untried_moves = game_state.get_valid_moves() 
+        self.result = game_state.get_game_state()
+        # proven game value for player_who_moved (1 win, 0.5 draw, 0 loss), None until solved
+        self.proven = None
+        if self.result != 0:
+            self.proven = 1 if self.result == player_who_moved else 0.5 if self.result == 3 else 0
+    @property
+    def game_state(self):
+        """A fresh copy of the game at this node, rebuilt from the root"""
+        moves = []
+        node = self
+        while node.parent is not None:
+            moves.append((node.move, node.player_who_moved))
+            node = node.parent
+        state = node.root_state.copy_game()
+        for move, player in reversed(moves):
+            state.simulate_move(move, player)
+        return state
     def get_next_player(self):
         """Get the player whose turn it is at this node"""
         if self.player_who_moved is None: 
@@ -31,92 +129,647 @@ class Node:
     def is_fully_expanded(self):
         return len(self.untried_moves) == 0
     def is_terminal(self):
-        return self.game_state.get_game_state() != 0
-    def ucb1_score(self, C=math.sqrt(2)):
-        """Calculate UCB1 score for node selection"""
-        if self.visits==0:
+        return self.result != 0
+    def ucb1_score(self, C=math.sqrt(2), rave_k=None, parent_visits=None):
+        """
+        Calculate UCB1 score for node selection (virtual loss counts as lost visits)
+
+        parent_visits defaults to the visits of the first parent; a shared
+        DAG node is scored with the visits of the parent selecting it.
+        With rave_k set, the win rate is blended with the RAVE win rate using
+        weight sqrt(rave_k / (3 * visits + rave_k)), which fades as the node
+        collects visits of its own.
+        """
+        visits = self.visits + self.virtual_loss
+        # <= 0: adding and removing fractional virtual loss can leave rounding residue
+        if visits <= 0:
             return float('inf')
         else:
-            return (self.wins/self.visits) + C * math.sqrt(math.log(self.parent.visits) / self.visits)
-    def select_best_child(self):
-        """Select child with highest UCB1 score"""
-        if not self.children:  
+            if parent_visits is None:
+                parent_visits = self.parent.visits + self.parent.virtual_loss
+            value = self.wins / visits
+            if rave_k is not None and self.rave_visits > 0:
+                beta = math.sqrt(rave_k / (3 * visits + rave_k))
+                value = (1 - beta) * value + beta * self.rave_wins / self.rave_visits
+            # fractional virtual loss can leave a parent with less than one visit
+            return value + C * math.sqrt(math.log(max(parent_visits, 1)) / visits)
+    def select_best_child(self, skip_proven=False, rave_k=None):
+        """Select child with highest UCB1 score (optionally among unsolved children only)"""
+        children = self.children
+        if skip_proven:
+            children = [child for child in children if child.proven is None]
+        if not children:  
             return None
-        best_score = max(child.ucb1_score() for child in self.children)
-        best_children = [child for child in self.children if child.ucb1_score() == best_score]
+        parent_visits = self.visits + self.virtual_loss
+        scores = [child.ucb1_score(rave_k=rave_k, parent_visits=parent_visits) for child in children]
+        best_score = max(scores)
+        best_children = [child for child, score in zip(children, scores) if score == best_score]
         return random.choice(best_children)  
-    def expand_node(self):
+    def update_proven(self):
+        """
+        Solve this node from its children if possible. Returns True when
+        the node is (now) proven.
+        """
+        if self.proven is not None:
+            return True
+        # the opponent of player_who_moved chooses among the children
+        if any(child.proven == 1 for child in self.children):
+            self.proven = 0
+        elif self.is_fully_expanded() and all(child.proven is not None for child in self.children):
+            self.proven = 1 - max(child.proven for child in self.children)
+        return self.proven is not None
+    def move_to(self, child):
+        """Column played from this node to reach child"""
+        if child.parent is self:
+            return child.move
+        return self.transposed_moves[child][0]
+    def cell_to(self, child):
+        """(row, col) filled by the move from this node to child"""
+        if child.parent is self:
+            return child.cell
+        return self.transposed_moves[child][1]
+    def expand_node(self, state=None, table=None):
+        """
+        Add a child for one untried move.
+
+        Args:
+            state: game positioned at this node (left unchanged); rebuilt
+                from the root when not given
+            table: optional dict of nodes by (position hash, player who
+                moved). A position already in it is linked as a child
+                instead of creating a new node
+        """
         if not self.is_fully_expanded():
+            if state is None:
+                state = self.game_state
             move_to_try=self.untried_moves.pop()
             player=self.get_next_player()
-            current_state=self.game_state.copy_game()
-            current_state.simulate_move(move_to_try,player)
-            child=Node(current_state,move_to_try,self,player)
+            undo_info = state.simulate_move(move_to_try,player)
+            child = None
+            if table is not None:
+                key = (state.hash, player)
+                child = table.get(key)
+                if child is not None:
+                    if self.transposed_moves is None:
+                        self.transposed_moves = {}
+                    self.transposed_moves[child] = (move_to_try, undo_info)
+            if child is None:
+                child=Node(state,move_to_try,self,player)
+                child.cell = undo_info
+                if table is not None:
+                    table[key] = child
+            state.undo_move(undo_info)
             self.children.append(child)  
             return child
         else:
             return None
-    def simulate(self):
-        """Run a random simulation from this node to a terminal state"""
-        current_state=self.game_state.copy_game()
-        player=self.get_next_player()
-        while current_state.get_game_state() == 0 and len(current_state.get_valid_moves()) > 0:
-            valid_moves = current_state.get_valid_moves()
-            move_to_make=random.choice(valid_moves)
-            current_state.simulate_move(move_to_make,player)
-            player=3-player
-        return current_state.get_game_state()  
-    def backpropagate(self, result):
-        """Update statistics back up the tree"""
+    def simulate(self, state=None, moves=None):
+        """
+        Run a random simulation from this node to a terminal state
+
+        Args:
+            state: game positioned at this node (restored before
+                returning); rebuilt from the root when not given
+            moves: optional list collecting the ((row, col), player) moves played
+        """
+        if state is None:
+            state = self.game_state
+        return random_rollout(state, self.get_next_player(), moves)
+    def update(self, result):
+        """Add one simulation result to this node's statistics"""
         self.visits += 1
         if result == self.player_who_moved:
             self.wins += 1
         elif result == 3:  
             self.wins += 0.5
+    def update_counts(self, outcomes):
+        """Add batch_rollout outcome counts to this node's statistics"""
+        self.visits += int(outcomes[1] + outcomes[2] + outcomes[3])
+        if self.player_who_moved in (1, 2):
+            self.wins += int(outcomes[self.player_who_moved]) + 0.5 * int(outcomes[3])
+    def backpropagate(self, result):
+        """Update statistics back up the tree"""
+        self.update(result)
         if self.parent:
             self.parent.backpropagate(result)
+    def update_rave(self, moves, result):
+        """
+        Credit result to every child whose move appears in moves, the set of
+        ((row, col), player) moves played after this node in one simulation.
+        Moves are told apart by the cell they fill rather than the column.
+        """
+        for child in self.children:
+            if (self.cell_to(child), child.player_who_moved) in moves:
+                child.rave_visits += 1
+                if result == child.player_who_moved:
+                    child.rave_wins += 1
+                elif result == 3:
+                    child.rave_wins += 0.5
 class MCTSPlayer:
-        def __init__(self, simulations=1000):
-            """MCTS-based Connect 4 player"""
+        def __init__(self, simulations=1000, reuse_tree=False, rollouts_per_leaf=1, time_limit=None,
+                     early_stop=False, solver=False, rave=False, rave_k=300, transpositions=False):
+            """
+            MCTS-based Connect 4 player
+
+            Args:
+                simulations: simulations (tree descents) per move, ignored
+                    when time_limit is set
+                reuse_tree: keep the tree between get_move calls and
+                    continue from the subtree of the position reached
+                rollouts_per_leaf: random games played from each new leaf;
+                    above 1 they run together through batch_rollout and
+                    each counts as a visit
+                time_limit: seconds per move; when set, simulations run
+                    until the time is up
+                early_stop: stop as soon as no other root move can catch
+                    up with the most visited one in the remaining budget
+                solver: propagate proven wins, draws and losses up the
+                    tree (MCTS-Solver), skip solved subtrees during
+                    selection and stop once the root is solved
+                rave: also score children by all-moves-as-first statistics
+                    gathered from the tree path and rollout moves (RAVE),
+                    which mostly helps at small simulation budgets. Only
+                    single rollouts (rollouts_per_leaf=1) feed these stats
+                rave_k: visit count around which RAVE and plain win rates
+                    get equal weight
+                transpositions: share one node between all move orders
+                    reaching a position (looked up by Zobrist hash), so the
+                    search grows a DAG. Results are backpropagated along
+                    the path actually taken. With reuse_tree the table is
+                    rebuilt from the nodes under the reused root
+            """
             self.simulations = simulations
-        def _select(self, node):
-            """Phase 1: Selection - Navigate down the tree using UCB1"""
+            self.reuse_tree = reuse_tree
+            self.rollouts_per_leaf = rollouts_per_leaf
+            self.time_limit = time_limit
+            self.early_stop = early_stop
+            self.solver = solver
+            self.rave = rave
+            self.rave_k = rave_k
+            self.transpositions = transpositions
+            self._table = None
+            self.reused_visits = 0
+            self.simulations_run = 0
+            self._root = None
+            self._deadline = None
+            self._start = None
+            # last clock reading by _budget_left, and the simulations done by then
+            self._clock = None
+            self._clock_done = 0
+        def _new_root(self, game, player):
+            """Root for a search of game: the reused subtree, or a fresh Node"""
+            root = self._reused_root(game, player) if self.reuse_tree else None
+            if root is None:
+                root = Node(game, parent=None, player_who_moved=3 - player) 
+                if self.transpositions:
+                    self._table = {(game.hash, 3 - player): root}
+            elif self.transpositions:
+                self._table = self._reachable_table(root)
+            self.reused_visits = root.visits
+            return root
+        def _budget_left(self, done, check_every=8):
+            """Whether to run more simulations after done of them"""
+            if self._deadline is None:
+                return done < self.simulations
+            # reading the clock only every few simulations keeps its cost negligible
+            if done % check_every:
+                return True
+            self._clock = time.perf_counter()
+            self._clock_done = done
+            return done == 0 or self._clock < self._deadline
+        def _decided(self, root, done):
+            """Whether the most visited root move can no longer be overtaken"""
+            if not root.children:
+                return False
+            if root.is_fully_expanded() and len(root.children) == 1:
+                return True
+            visits = sorted((child.visits for child in root.children), reverse=True)
+            lead = visits[0] - (visits[1] if len(visits) > 1 else 0)
+            if self._deadline is None:
+                remaining = self.simulations - done
+            else:
+                # reuse the last reading of _budget_left rather than reading the clock per simulation
+                now, clock_done = self._clock, self._clock_done
+                if clock_done == 0 or now <= self._start:
+                    return False
+                # estimate how many more simulations fit at the rate so far
+                remaining = clock_done / (now - self._start) * (self._deadline - now) - (done - clock_done)
+            return lead > remaining * self.rollouts_per_leaf
+        def _reused_root(self, game, player):
+            """Find the position of game within the previous tree (up to two plies down)"""
+            old_root, self._root = self._root, None
+            if old_root is None:
+                return None
+            node = self._find_position(old_root, old_root.root_state, game, player, 2)
+            if node is not None:
+                node.parent = None
+                node.root_state = game.copy_game()
+            return node
+        def _reachable_table(self, root):
+            """
+            Transposition table of the nodes reachable from a reused root.
+            A node whose first parent was dropped with the rest of the old
+            tree gets a reachable parent, so its parent chain and move stay
+            within the new tree.
+            """
+            state = root.root_state.copy_game()
+            table = {(state.hash, root.player_who_moved): root}
+            def visit(node):
+                for child in node.children:
+                    undo_info = state.simulate_move(node.move_to(child), child.player_who_moved)
+                    key = (state.hash, child.player_who_moved)
+                    if key not in table:
+                        table[key] = child
+                        visit(child)
+                    state.undo_move(undo_info)
+            visit(root)
+            reachable = set(map(id, table.values()))
+            for node in table.values():
+                for child in node.children:
+                    if child.parent is not None and child.parent is not node and id(child.parent) not in reachable:
+                        child.move, child.cell = node.transposed_moves.pop(child)
+                        child.parent = node
+            return table
+        def _find_position(self, node, state, game, player, depth):
+            if state.hash == game.hash and node.get_next_player() == player:
+                return node
+            if depth == 0:
+                return None
+            for child in node.children:
+                undo_info = state.simulate_move(node.move_to(child), child.player_who_moved)
+                found = self._find_position(child, state, game, player, depth - 1)
+                state.undo_move(undo_info)
+                if found is not None:
+                    return found
+            return None
+        def _select(self, node, state, path=None):
+            """
+            Phase 1: Selection - Navigate down the tree using UCB1
+
+            Plays the moves along the way on state and returns the
+            selected node with the undo information for those moves.
+            The nodes passed are appended to path, if given.
+            """
+            path_undo = []
             while not node.is_terminal() and node.is_fully_expanded():
-                best_child = node.select_best_child()
+                best_child = node.select_best_child(skip_proven=self.solver,
+                                                    rave_k=self.rave_k if self.rave else None)
                 if best_child is None:  
                     break
+                path_undo.append(state.simulate_move(node.move_to(best_child), best_child.player_who_moved))
                 node = best_child
+                if path is not None:
+                    path.append(node)
+            return node, path_undo
+        def _expand(self, node, state, path_undo, path):
+            """Phase 2: Expansion - add a child of node (played on state) if it has untried moves"""
+            if not node.is_terminal():
+                table = self._table if self.transpositions else None
+                expanded_node = node.expand_node(state, table)
+                if expanded_node:  
+                    path_undo.append(state.simulate_move(node.move_to(expanded_node), expanded_node.player_who_moved))
+                    node = expanded_node
+                    path.append(node)
             return node
              
+        def search(self, game, player):
+            """Run the simulations from game and return the root Node"""
+            root = self._new_root(game, player)
+            # one scratch board follows the search down and back up the tree
+            scratch = game.copy_game()
+            self._start = self._clock = time.perf_counter()
+            self._clock_done = 0
+            self._deadline = self._start + self.time_limit if self.time_limit is not None else None
+            done = 0
+            while self._budget_left(done):
+                if self.early_stop and self._decided(root, done):
+                    break
+                if self.solver and root.proven is not None:
+                    break
+                self._run_simulation(root, scratch)
+                done += 1
+            self.simulations_run = done
+            if self.reuse_tree:
+                self._root = root
+            return root
+        def _run_simulation(self, root, scratch):
+            """Selection, expansion, simulation and backpropagation, once"""
+            path = [root]
+            node, path_undo = self._select(root, scratch, path)
+            node = self._expand(node, scratch, path_undo, path)
+            rollout_moves = [] if self.rave else None
+            if self.rollouts_per_leaf > 1:
+                outcomes = batch_rollout(scratch, node.get_next_player(), self.rollouts_per_leaf)
+            else:
+                result = node.simulate(scratch, rollout_moves)
+            while path_undo:
+                scratch.undo_move(path_undo.pop())
+            # backpropagate along the path taken, as DAG nodes have several parents
+            if self.rollouts_per_leaf > 1:
+                for path_node in path:
+                    path_node.update_counts(outcomes)
+            else:
+                for path_node in path:
+                    path_node.update(result)
+                if self.rave:
+                    self._backpropagate_rave(path, set(rollout_moves), result)
+            if self.solver:
+                self._propagate_proven(path)
+        def _backpropagate_rave(self, path, moves, result):
+            """Update the AMAF statistics along path, from the leaf to the root"""
+            for i in range(len(path) - 1, -1, -1):
+                path[i].update_rave(moves, result)
+                if i > 0:
+                    moves.add((path[i - 1].cell_to(path[i]), path[i].player_who_moved))
+        def _propagate_proven(self, path):
+            """
+            Solve the nodes on path, from the last one up, for as long as
+            they become proven. The last node itself may be solvable: in a
+            DAG its children can be proven through another parent.
+            """
+            for node in reversed(path):
+                if not node.update_proven():
+                    break
+        def _best_child(self, root):
+            """Most visited root child; with the solver, proven wins first and proven losses last"""
+            if self.solver:
+                for child in root.children:
+                    if child.proven == 1:
+                        return child
+                not_lost = [child for child in root.children if child.proven != 0]
+                if not_lost:
+                    return max(not_lost, key=lambda child: child.visits)
+            return max(root.children, key=lambda child: child.visits)
+             
         def get_move(self, game, player):
             """Get the best move using MCTS"""
-            root = Node(game, parent=None, player_who_moved=3 - player) 
-            for i in range(self.simulations):
-                node = self._select(root)
-                if not node.is_terminal():
-                    expanded_node = node.expand_node()
-                    if expanded_node:  
-                        node = expanded_node
-                result = node.simulate()
-                node.backpropagate(result)
+            root = self.search(game, player)
             
             # Safety check: if no children were created, fall back to random valid move
             if not root.children:
-                valid_moves = root.game_state.get_valid_moves()
+                valid_moves = game.get_valid_moves()
                 if valid_moves:
                     return random.choice(valid_moves)
                 else:
                     return 0  
             
-            best_child = max(root.children, key=lambda child: child.visits)
-            return best_child.move
+            # a shared DAG child may have been reached from another parent first
+            return root.move_to(self._best_child(root))
 
-                
 
+class _WorkerPool:
+    """Lazily created process pool shared by the parallel players"""
+    _executor = None
 
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
 
+    def close(self):
+        """Shut down the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
 
- 
-        
-        
-   
\ No newline at end of file
+
+def _root_parallel_search(game, player, simulations, seed):
+    """Worker process: one independent search, returning root child visit counts"""
+    random.seed(seed)
+    root = MCTSPlayer(simulations).search(game, player)
+    return {child.move: child.visits for child in root.children}
+
+
+class RootParallelMCTSPlayer(_WorkerPool):
+    """
+    Root-parallel MCTS player.
+
+    Runs independent searches of the same position in worker processes,
+    each with its own seed, and sums their root child visit counts to
+    choose the move. Each worker runs the full simulation budget.
+    """
+    def __init__(self, simulations=1000, workers=4):
+        self.simulations = simulations
+        self.workers = workers
+        self.visit_counts = {}
+
+    def get_move(self, game, player):
+        """Get the best move from the merged worker searches"""
+        base_seed = random.getrandbits(32)
+        futures = [self._pool().submit(_root_parallel_search, game, player, self.simulations, base_seed + i)
+                   for i in range(self.workers)]
+        counts = {}
+        for future in futures:
+            for move, visits in future.result().items():
+                counts[move] = counts.get(move, 0) + visits
+        self.visit_counts = counts
+        if not counts:
+            valid_moves = game.get_valid_moves()
+            return random.choice(valid_moves) if valid_moves else 0
+        return max(counts, key=counts.get)
+
+
+def _parallel_rollout(state, player, seed):
+    """Worker process: one random rollout from a leaf state"""
+    random.seed(seed)
+    return random_rollout(state, player)
+
+
+class TreeParallelMCTSPlayer(MCTSPlayer, _WorkerPool):
+    """
+    Tree-parallel MCTS player with virtual loss.
+
+    Each round descends the shared tree leaves_per_worker times per worker.
+    A descent adds virtual_loss to every node on its path, which lowers
+    their UCB1 score, so the next descents of the round spread over other
+    branches. The round's rollouts then run in parallel worker processes
+    (leaves_per_worker per task, to amortize process communication), and
+    their real results are backpropagated as the virtual loss is removed.
+    With one worker the rollouts run in this process.
+    """
+    def __init__(self, simulations=1000, workers=4, virtual_loss=1.0, leaves_per_worker=4, reuse_tree=False,
+                 time_limit=None, early_stop=False, solver=False):
+        super().__init__(simulations, reuse_tree=reuse_tree, time_limit=time_limit, early_stop=early_stop,
+                         solver=solver)
+        self.workers = workers
+        self.virtual_loss = virtual_loss
+        self.leaves_per_worker = leaves_per_worker if workers > 1 else 1
+
+    def search(self, game, player):
+        """Run the simulations in rounds of parallel rollouts and return the root Node"""
+        root = self._new_root(game, player)
+        scratch = game.copy_game()
+        self._start = self._clock = time.perf_counter()
+        self._clock_done = 0
+        self._deadline = self._start + self.time_limit if self.time_limit is not None else None
+        done = 0
+        while self._budget_left(done, check_every=1):
+            if self.early_stop and self._decided(root, done):
+                break
+            if self.solver and root.proven is not None:
+                break
+            batch = self.workers * self.leaves_per_worker
+            if self._deadline is None:
+                batch = min(batch, self.simulations - done)
+            paths, states, players = [], [], []
+            for _ in range(batch):
+                path = [root]
+                node, path_undo = self._select(root, scratch, path)
+                node = self._expand(node, scratch, path_undo, path)
+                paths.append(path)
+                if not node.is_terminal():
+                    states.append(scratch.copy_game())
+                    players.append(node.get_next_player())
+                while path_undo:
+                    scratch.undo_move(path_undo.pop())
+                self._add_virtual_loss(node, self.virtual_loss)
+
+            if self.workers > 1:
+                seeds = [random.getrandbits(32) for _ in states]
+                chunksize = max(1, -(-len(states) // self.workers))
+                rollouts = iter(self._pool().map(_parallel_rollout, states, players, seeds, chunksize=chunksize))
+            else:
+                rollouts = iter(random_rollout(state, turn) for state, turn in zip(states, players))
+            for path in paths:
+                node = path[-1]
+                result = node.result if node.is_terminal() else next(rollouts)
+                self._add_virtual_loss(node, -self.virtual_loss)
+                node.backpropagate(result)
+                if self.solver:
+                    self._propagate_proven(path)
+            done += batch
+        self.simulations_run = done
+        if self.reuse_tree:
+            self._root = root
+        return root
+
+    def _add_virtual_loss(self, node, amount):
+        while node is not None:
+            node.virtual_loss += amount
+            node = node.parent
+
+
+class ArrayMCTSPlayer:
+    """
+    MCTS player that stores its tree in preallocated parallel arrays.
+
+    Nodes are integer indices into the arrays below and all children of a
+    node are allocated as one contiguous block when it is first expanded.
+    The search plays moves on a single scratch board (with undo), so a
+    simulation allocates no nodes and copies no boards. With the same
+    random seed it makes the same choices as MCTSPlayer's default search.
+    """
+    def __init__(self, simulations=1000, C=math.sqrt(2)):
+        self.simulations = simulations
+        self.C = C
+        self.capacity = 0
+        self._allocate(1 + simulations * 7)
+
+    def _allocate(self, capacity):
+        """Grow the node arrays to hold at least capacity nodes"""
+        extra = capacity - self.capacity
+        if extra <= 0:
+            return
+        if self.capacity == 0:
+            self.visits, self.wins = [], []
+            self.parent, self.first_child, self.num_children = [], [], []
+            self.expanded, self.move, self.player = [], [], []
+        self.visits.extend([0] * extra)
+        self.wins.extend([0.0] * extra)
+        self.parent.extend([-1] * extra)
+        self.first_child.extend([-1] * extra)   # -1 = children not allocated yet
+        self.num_children.extend([0] * extra)
+        self.expanded.extend([0] * extra)       # children visited so far
+        self.move.extend([-1] * extra)
+        self.player.extend([0] * extra)         # player who made move
+        self.capacity = capacity
+
+    def _new_node(self, parent, move, player):
+        node = self.size
+        self.size += 1
+        self.visits[node] = 0
+        self.wins[node] = 0.0
+        self.parent[node] = parent
+        self.first_child[node] = -1
+        self.num_children[node] = 0
+        self.expanded[node] = 0
+        self.move[node] = move
+        self.player[node] = player
+        return node
+
+    def _allocate_children(self, node, valid_moves):
+        if self.size + len(valid_moves) > self.capacity:
+            self._allocate(2 * self.capacity + len(valid_moves))
+        self.first_child[node] = self.size
+        self.num_children[node] = len(valid_moves)
+        child_player = 3 - self.player[node]
+        # same expansion order as Node, which pops from the end of the list
+        for move in reversed(valid_moves):
+            self._new_node(node, move, child_player)
+
+    def _select_child(self, node):
+        """Child of a fully expanded node with the highest UCB1 score"""
+        visits, wins = self.visits, self.wins
+        log_parent = math.log(visits[node])
+        first = self.first_child[node]
+        best_children, best_score = [], -1.0
+        for child in range(first, first + self.num_children[node]):
+            score = wins[child] / visits[child] + self.C * math.sqrt(log_parent / visits[child])
+            if score > best_score:
+                best_children, best_score = [child], score
+            elif score == best_score:
+                best_children.append(child)
+        # ties are broken like Node.select_best_child, which draws even for a single child
+        return random.choice(best_children)
+
+    def get_move(self, game, player):
+        """Get the best move using MCTS"""
+        self.size = 0
+        root = self._new_node(-1, -1, 3 - player)
+        scratch = game.copy_game()
+        path_undo = []
+        rollout_undo = []
+        for i in range(self.simulations):
+            # Selection
+            node = root
+            while (scratch.get_game_state() == 0 and self.first_child[node] != -1
+                   and self.expanded[node] == self.num_children[node] and self.num_children[node]):
+                node = self._select_child(node)
+                path_undo.append(scratch.simulate_move(self.move[node], self.player[node]))
+            # Expansion
+            if scratch.get_game_state() == 0:
+                if self.first_child[node] == -1:
+                    self._allocate_children(node, scratch.get_valid_moves())
+                if self.expanded[node] < self.num_children[node]:
+                    node = self.first_child[node] + self.expanded[node]
+                    self.expanded[self.parent[node]] += 1
+                    path_undo.append(scratch.simulate_move(self.move[node], self.player[node]))
+            # Simulation
+            turn = 3 - self.player[node]
+            result = scratch.get_game_state()
+            while result == 0:
+                valid_moves = scratch.get_valid_moves()
+                if not valid_moves:
+                    break
+                rollout_undo.append(scratch.simulate_move(random.choice(valid_moves), turn))
+                turn = 3 - turn
+                result = scratch.get_game_state()
+            while rollout_undo:
+                scratch.undo_move(rollout_undo.pop())
+            while path_undo:
+                scratch.undo_move(path_undo.pop())
+            # Backpropagation
+            while node != -1:
+                self.visits[node] += 1
+                if result == self.player[node]:
+                    self.wins[node] += 1
+                elif result == 3:
+                    self.wins[node] += 0.5
+                node = self.parent[node]
+
+        first = self.first_child[root]
+        if first == -1 or self.expanded[root] == 0:
+            valid_moves = game.get_valid_moves()
+            return random.choice(valid_moves) if valid_moves else 0
+        children = range(first, first + self.expanded[root])
+        return self.move[max(children, key=lambda child: self.visits[child])]
@@ -1,18 +1,473 @@
 from connect4 import Connect4
 from math import inf
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+# transposition table bound types
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+# mixed into the position hash so entries searched for different players
+# or sides to move never share a slot: _SEARCH_KEYS[player][maximizing]
+_rng = random.Random(7)
+_SEARCH_KEYS = [[_rng.getrandbits(64) for _ in range(2)] for _ in range(3)]
+
+
+class _SearchTimeout(Exception):
+    """Raised inside the search when the time budget runs out"""
+
+
+# per-process state of the parallel search worker processes
+_worker_player = None
+_shared_alpha = None
+
+
+def _init_search_worker(settings, shared_alpha=None, stop=None, tt=None):
+    """Worker process initializer: keep one searcher (and its table) per process"""
+    global _worker_player, _shared_alpha
+    _shared_alpha = shared_alpha
+    _worker_player = MinimaxPlayer(**settings)
+    _worker_player._stop = stop
+    if tt is not None:
+        _worker_player.tt = tt
+
+
+def _root_move_search(game, col, depth, player, deadline):
+    """
+    Worker process: search the root move col to depth plies, using the best
+    root score found so far as alpha and publishing a better one.
+
+    Returns:
+        (score, alpha used, nodes searched); the score is exact when it is
+        above the alpha used, otherwise only an upper bound
+    """
+    searcher = _worker_player
+    searcher.nodes_searched = 0
+    searcher._root_depth = depth
+    searcher._root_pv_move = None
+    searcher._deadline = deadline
+    alpha = _shared_alpha.value
+    game.simulate_move(col, player)
+    try:
+        if searcher.use_alpha_beta and searcher.search == 'pvs':
+            score, _ = searcher.pvs(game, depth - 1, -inf, -alpha, False, player)
+            score = -score
+        elif searcher.use_alpha_beta:
+            score, _ = searcher.minimax_ab(game, depth - 1, alpha, inf, False, player)
+        else:
+            score, _ = searcher.minimax_basic(game, depth - 1, False, player)
+    finally:
+        searcher._deadline = None
+    if score > alpha:
+        with _shared_alpha.get_lock():
+            if score > _shared_alpha.value:
+                _shared_alpha.value = score
+    return score, alpha, searcher.nodes_searched
+
+
+def _lazy_smp_search(game, player, max_depth, index):
+    """
+    Worker process: Lazy SMP helper. Deepens on the root until the main
+    search sets the stop flag, filling the shared transposition table.
+    Odd helpers search one ply deeper and each helper starts the root
+    moves at a different column. Returns the number of nodes searched.
+    """
+    searcher = _worker_player
+    searcher.nodes_searched = 0
+    searcher._root_pv_move = None
+    searcher._root_rotation = index
+    searcher._mtdf_scores = {}
+    searcher._deadline = inf
+    try:
+        for depth in range(1 + index % 2, max_depth + 1):
+            searcher._search(game, depth, player)
+    except _SearchTimeout:
+        pass
+    finally:
+        searcher._deadline = None
+    return searcher.nodes_searched
+
+
+class TranspositionTable:
+    """
+    Fixed-size transposition table indexed by position hash.
+
+    Each slot holds one (key, depth, score, flag, move) entry. With the
+    'depth' replacement policy a slot keeps the deeper of the old and new
+    entries; with 'always' the newest entry wins.
+    """
+    def __init__(self, size=1 << 20, replacement='depth'):
+        if replacement not in ('depth', 'always'):
+            raise ValueError(f"Unknown replacement policy: {replacement}")
+        self.size = size
+        self.replacement = replacement
+        self.entries = [None] * size
+
+    def lookup(self, key):
+        """Return the (key, depth, score, flag, move) entry for key, or None"""
+        entry = self.entries[key % self.size]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, score, flag, move):
+        index = key % self.size
+        old = self.entries[index]
+        if (self.replacement == 'depth' and old is not None
+                and old[0] != key and old[1] > depth):
+            return
+        self.entries[index] = (key, depth, score, flag, move)
+
+    def clear(self):
+        self.entries = [None] * self.size
+
+
+class SharedTranspositionTable:
+    """
+    Transposition table in shared memory, for searches in several processes.
+
+    Same interface and replacement policies as TranspositionTable. Each
+    slot is two 64-bit words: the packed (depth, score, flag, move) data,
+    and the key XORed with that data. Writers take no lock; a slot torn by
+    two processes writing at once no longer matches its key and reads as
+    a miss. Pickling the table (e.g. to a worker process) attaches to the
+    same memory. The creating process should call unlink() when done.
+    """
+    def __init__(self, size=1 << 20, replacement='depth', name=None):
+        if replacement not in ('depth', 'always'):
+            raise ValueError(f"Unknown replacement policy: {replacement}")
+        self.size = size
+        self.replacement = replacement
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=16 * size)
+            self._shm.buf[:16 * size] = bytes(16 * size)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self.name = self._shm.name
+        self._slots = self._shm.buf.cast('Q')
+
+    def __getstate__(self):
+        return {'size': self.size, 'replacement': self.replacement, 'name': self.name}
+
+    def __setstate__(self, state):
+        self.__init__(state['size'], state['replacement'], state['name'])
+
+    @staticmethod
+    def _pack(depth, score, flag, move):
+        move = 0 if move is None else move + 1
+        return (int(score) + (1 << 31)) | depth << 32 | flag << 40 | move << 42
+
+    def lookup(self, key):
+        """Return the (key, depth, score, flag, move) entry for key, or None"""
+        index = 2 * (key % self.size)
+        data = self._slots[index + 1]
+        if self._slots[index] ^ data != key:
+            return None
+        move = data >> 42
+        return (key, data >> 32 & 0xFF, (data & 0xFFFFFFFF) - (1 << 31), data >> 40 & 3,
+                move - 1 if move else None)
+
+    def store(self, key, depth, score, flag, move):
+        index = 2 * (key % self.size)
+        if self.replacement == 'depth':
+            old_data = self._slots[index + 1]
+            if self._slots[index] ^ old_data != key and old_data >> 32 & 0xFF > depth:
+                return
+        data = self._pack(depth, score, flag, move)
+        self._slots[index] = key ^ data
+        self._slots[index + 1] = data
+
+    def clear(self):
+        self._shm.buf[:16 * self.size] = bytes(16 * self.size)
+
+    def __del__(self):
+        # release the buffer view, or SharedMemory cannot close on exit
+        if getattr(self, '_slots', None) is not None:
+            self.close()
+
+    def close(self):
+        """Detach this process from the shared memory"""
+        if self._slots is not None:
+            self._slots.release()
+            self._slots = None
+            self._shm.close()
+
+    def unlink(self):
+        """Detach and free the shared memory (call once, from the creating process)"""
+        self.close()
+        self._shm.unlink()
+
+
+class MoveOrdering:
+    """
+    Move ordering for minimax_ab.
+
+    Each heuristic can be switched off on its own:
+        center: try central columns before edge columns
+        pv: try the principal-variation move (transposition table move, or
+            the previous iteration's choice at the root) first
+        killers: next try moves that caused a cutoff at the same ply
+        history: rank the remaining moves by how often (weighted by
+            depth squared) they caused cutoffs for the same player
+    """
+    def __init__(self, center=True, pv=True, killers=True, history=True, num_killers=2):
+        self.center = center
+        self.pv = pv
+        self.killers = killers
+        self.history = history
+        self.num_killers = num_killers
+        self.reset()
+
+    def reset(self):
+        """Forget killer moves and history scores"""
+        self.killer_moves = []
+        self.history_table = {}
+
+    def order(self, game, moves, ply, player, pv_move=None):
+        """Return moves sorted so the most promising come first"""
+        center = game.cols // 2
+        if self.history:
+            history = self.history_table
+            if self.center:
+                moves = sorted(moves, key=lambda col: (-history.get((player, col), 0), abs(col - center)))
+            else:
+                moves = sorted(moves, key=lambda col: -history.get((player, col), 0))
+        elif self.center:
+            moves = sorted(moves, key=lambda col: abs(col - center))
+        front = []
+        if self.pv and pv_move is not None and pv_move in moves:
+            front.append(pv_move)
+        if self.killers and ply < len(self.killer_moves):
+            for col in self.killer_moves[ply]:
+                if col in moves and col not in front:
+                    front.append(col)
+        if front:
+            moves = front + [col for col in moves if col not in front]
+        return moves
+
+    def record_cutoff(self, col, ply, player, depth):
+        """Remember a move that caused a beta cutoff"""
+        if self.killers:
+            while len(self.killer_moves) <= ply:
+                self.killer_moves.append([])
+            killers = self.killer_moves[ply]
+            if col not in killers:
+                killers.insert(0, col)
+                del killers[self.num_killers:]
+        if self.history:
+            self.history_table[(player, col)] = self.history_table.get((player, col), 0) + depth * depth
 
 
 class MinimaxPlayer:
-    def __init__(self, depth=6, use_alpha_beta=True):
+    def __init__(self, depth=6, use_alpha_beta=True, tt_size=None, tt_replacement='depth',
+                 time_limit=None, move_ordering=None, workers=1, parallel='root', search='alphabeta'):
+        """
+        Args:
+            depth: search depth in plies (ignored when time_limit is set)
+            use_alpha_beta: use minimax_ab instead of minimax_basic
+            tt_size: number of transposition table slots used by
+                minimax_ab (None disables the table)
+            tt_replacement: 'depth' or 'always', see TranspositionTable
+            time_limit: seconds per move; when set, search deepens one ply
+                at a time and returns the best move of the deepest
+                completed iteration once the time is up
+            move_ordering: a MoveOrdering used by minimax_ab, or True for
+                the default one (None searches columns left to right)
+            workers: number of worker processes. Call close() to shut
+                them down
+            parallel: how workers above 1 share the search:
+                'root' splits the root moves between the workers. The
+                    first move is searched alone, then the rest in
+                    parallel, each starting from the best root score found
+                    so far as its alpha bound. Each worker keeps its own
+                    transposition table
+                'lazy_smp' runs workers-1 helper processes that deepen on
+                    the same root with different move orders while this
+                    process runs the main (iterative deepening) search.
+                    All of them share one SharedTranspositionTable of
+                    tt_size slots (2**20 when tt_size is not set), created
+                    with the workers; only the main search picks the move
+            search: alpha-beta variant used when use_alpha_beta is set:
+                'alphabeta' for minimax_ab, 'pvs' for pvs (negamax
+                Principal Variation Search, same values), or 'mtdf' for
+                mtdf (zero-window minimax_ab searches converging on the
+                value, run under iterative deepening). 'mtdf' needs a
+                transposition table and creates a default one when
+                tt_size is not set; it cannot be combined with
+                root-split workers
+        """
         self.depth = depth
         self.use_alpha_beta = use_alpha_beta
+        lazy_smp = workers > 1 and parallel == 'lazy_smp'
+        # Lazy SMP shares a table the worker pool creates (see _pool)
+        self.tt = TranspositionTable(tt_size, tt_replacement) if tt_size and not lazy_smp else None
+        self._tt_size = tt_size or 1 << 20
+        self._tt_replacement = tt_replacement
+        self.time_limit = time_limit
+        self.move_ordering = MoveOrdering() if move_ordering is True else move_ordering
+        if parallel not in ('root', 'lazy_smp'):
+            raise ValueError(f"Unknown parallel search: {parallel}")
+        if search not in ('alphabeta', 'pvs', 'mtdf'):
+            raise ValueError(f"Unknown search: {search}")
+        if workers > 1 and parallel == 'root' and search == 'mtdf':
+            raise ValueError("Root-split parallel search does not support search='mtdf'")
+        self.search = search
+        if search == 'mtdf' and self.tt is None and not lazy_smp:
+            self.tt = TranspositionTable(replacement=tt_replacement)
+        self.workers = workers
+        self.parallel = parallel
+        self.nodes_searched = 0
+        self.depth_reached = 0
+        self.mtdf_passes = 0
+        self._deadline = None
+        # MTD(f) first guesses: the score of each iteration, by depth
+        self._mtdf_scores = {}
+        self._executor = None
+        self._shared_alpha = None
+        self._stop = None
+        # Lazy SMP helpers start the root moves at a different column
+        self._root_rotation = 0
+        # depth of the current root, and the move the previous iteration chose there
+        self._root_depth = depth
+        self._root_pv_move = None
 
     def get_best_move(self, game, player):
+        self.nodes_searched = 0
+        self.mtdf_passes = 0
+        self._root_pv_move = None
+        self._mtdf_scores = {}
+        if self.move_ordering is not None:
+            self.move_ordering.reset()
+        if self.workers > 1 and self.parallel == 'lazy_smp':
+            return self._lazy_smp(game, player)
+        if self.time_limit is not None or (self.use_alpha_beta and self.search == 'mtdf'):
+            return self._iterative_deepening(game, player)
+        self.depth_reached = self.depth
+        return self._search(game, self.depth, player)[1]
+    def _search(self, game, depth, player):
+        self._root_depth = depth
+        if self.workers > 1 and self.parallel == 'root':
+            return self._root_split_search(game, depth, player)
+        if self.use_alpha_beta and self.search == 'pvs':
+            return self.pvs(game, depth, -inf, inf, True, player)
+        if self.use_alpha_beta and self.search == 'mtdf':
+            # scores swing between odd and even depths, so prefer the last iteration of the same parity
+            guess = self._mtdf_scores.get(depth - 2, self._mtdf_scores.get(depth - 1))
+            if guess is None:
+                guess = game.evaluate_position(player)
+            score, move = self.mtdf(game, depth, guess, player)
+            self._mtdf_scores[depth] = score
+            return score, move
         if self.use_alpha_beta:
-            return self.minimax_ab(game, self.depth, -inf, inf, True, player)[1]
+            return self.minimax_ab(game, depth, -inf, inf, True, player)
         else:
-            return self.minimax_basic(game, self.depth, True, player)[1]
+            return self.minimax_basic(game, depth, True, player)
+    def _iterative_deepening(self, game, player):
+        """Deepen one ply at a time until time_limit runs out (or up to depth, without one)"""
+        deadline = time.perf_counter() + self.time_limit if self.time_limit is not None else None
+        # an interrupted search leaves moves on the board, so search a copy
+        search_game = game.copy_game()
+        max_depth = int((game.board == 0).sum()) if deadline is not None else self.depth
+        best_move = None
+        self.depth_reached = 0
+        for depth in range(1, max_depth + 1):
+            # always finish depth 1 so there is a move to return
+            self._deadline = deadline if depth > 1 else None
+            try:
+                _, move = self._search(search_game, depth, player)
+            except _SearchTimeout:
+                break
+            finally:
+                self._deadline = None
+            best_move = move
+            self._root_pv_move = move
+            self.depth_reached = depth
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        return best_move
+    def _lazy_smp(self, game, player):
+        """Run the main search while helper processes fill the shared table"""
+        pool = self._pool()
+        self._stop.value = 0
+        max_depth = int((game.board == 0).sum())
+        helpers = [pool.submit(_lazy_smp_search, game, player, max_depth, index)
+                   for index in range(1, self.workers)]
+        try:
+            return self._iterative_deepening(game, player)
+        finally:
+            self._stop.value = 1
+            for helper in helpers:
+                self.nodes_searched += helper.result()
+    def _pool(self):
+        if self._executor is None:
+            settings = {'depth': self.depth, 'use_alpha_beta': self.use_alpha_beta,
+                        'move_ordering': self.move_ordering, 'search': self.search}
+            if self.parallel == 'lazy_smp':
+                self.tt = SharedTranspositionTable(self._tt_size, self._tt_replacement)
+                self._stop = multiprocessing.Value('b', 0)
+                initargs = (settings, None, self._stop, self.tt)
+                max_workers = self.workers - 1
+            else:
+                self._shared_alpha = multiprocessing.Value('d', -inf)
+                settings['tt_size'] = self.tt.size if self.tt is not None else None
+                settings['tt_replacement'] = self.tt.replacement if self.tt is not None else 'depth'
+                initargs = (settings, self._shared_alpha)
+                max_workers = self.workers
+            self._executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_search_worker,
+                                                 initargs=initargs)
+        return self._executor
+    def close(self):
+        """
+        Shut down the worker processes and free a shared transposition
+        table. The next search starts new ones.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if isinstance(self.tt, SharedTranspositionTable):
+            self.tt.unlink()
+            self.tt = None
+        self._stop = None
+        self._shared_alpha = None
+    def _root_split_search(self, game, depth, player):
+        """Search the root moves in the worker processes and combine their scores"""
+        self.nodes_searched += 1
+        valid_moves = game.get_valid_moves()
+        if depth == 0 or game.get_game_state() != 0 or not valid_moves:
+            return game.evaluate_position(player), None
+        if self.move_ordering is not None:
+            valid_moves = self.move_ordering.order(game, valid_moves, 0, player, self._root_pv_move)
+        pool = self._pool()
+        self._shared_alpha.value = -inf
+        # the first (most promising) move alone gives the others a bound to search against
+        first = pool.submit(_root_move_search, game, valid_moves[0], depth, player, self._deadline)
+        futures = [first]
+        try:
+            first.result()
+            futures += [pool.submit(_root_move_search, game, col, depth, player, self._deadline)
+                        for col in valid_moves[1:]]
+            results = [future.result() for future in futures]
+        except _SearchTimeout:
+            for future in futures:
+                future.cancel()
+            raise
+        best_score, best_col = -inf, valid_moves[0]
+        for col, (score, alpha, nodes) in zip(valid_moves, results):
+            self.nodes_searched += nodes
+            # a score at or below its alpha is only an upper bound, never better than an exact one
+            if score > alpha and score > best_score:
+                best_score, best_col = score, col
+        return best_score, best_col
+    def _check_time(self):
+        if self.nodes_searched & 255 == 0 and (time.perf_counter() >= self._deadline
+                                               or (self._stop is not None and self._stop.value)):
+            raise _SearchTimeout()
     def minimax_basic(self, game, depth, maximizing_player, player):
+        self.nodes_searched += 1
+        if self._deadline is not None:
+            self._check_time()
         if depth == 0 or game.get_game_state() != 0:
             return game.evaluate_position(player), None
         
@@ -43,12 +498,136 @@ class MinimaxPlayer:
                     best_col = col
             return best_score, best_col
     def minimax_ab(self, game, depth, alpha, beta, maximizing_player, player):
+        self.nodes_searched += 1
+        if self._deadline is not None:
+            self._check_time()
         if depth == 0 or game.get_game_state() != 0:
             return game.evaluate_position(player), None
         
         valid_moves = game.get_valid_moves()
         if not valid_moves:  
             return game.evaluate_position(player), None
+        key = None
+        pv_move = self._root_pv_move if depth == self._root_depth else None
+        if self.tt is not None:
+            key = game.hash ^ _SEARCH_KEYS[player][maximizing_player]
+            entry = self.tt.lookup(key)
+            if entry is not None:
+                _, entry_depth, score, flag, move = entry
+                if entry_depth >= depth and (flag == EXACT or (flag == LOWER_BOUND and score >= beta)
+                                             or (flag == UPPER_BOUND and score <= alpha)):
+                    return score, move
+                if move is not None:
+                    pv_move = move
+        valid_moves = self._order_moves(game, valid_moves, depth, maximizing_player, player, pv_move)
+        best_score, best_col = self._minimax_ab_children(game, valid_moves, depth, alpha, beta, maximizing_player, player)
+        if key is not None:
+            if best_score <= alpha:
+                flag = UPPER_BOUND
+            elif best_score >= beta:
+                flag = LOWER_BOUND
+            else:
+                flag = EXACT
+            self.tt.store(key, depth, best_score, flag, best_col)
+        return best_score, best_col
+    def mtdf(self, game, depth, first_guess, player):
+        """
+        MTD(f): narrow the root value down with zero-window minimax_ab
+        searches, starting from first_guess. The transposition table keeps
+        the bounds found by earlier passes, so each pass mostly re-reads
+        them. Returns the same (score, col) value as minimax_ab.
+        """
+        score = first_guess
+        lower, upper = -inf, inf
+        best_col = None
+        while lower < upper:
+            beta = score + 1 if score == lower else score
+            score, col = self.minimax_ab(game, depth, beta - 1, beta, True, player)
+            self.mtdf_passes += 1
+            if score < beta:
+                upper = score
+            else:
+                # a fail-high pass proves its move reaches the new lower bound
+                lower = score
+                best_col = col
+            if best_col is None:
+                best_col = col
+        return score, best_col
+    def _order_moves(self, game, valid_moves, depth, maximizing_player, player, pv_move):
+        if self.move_ordering is not None:
+            mover = player if maximizing_player else 3 - player
+            valid_moves = self.move_ordering.order(game, valid_moves, self._root_depth - depth, mover, pv_move)
+        if self._root_rotation and depth == self._root_depth:
+            shift = self._root_rotation % len(valid_moves)
+            valid_moves = valid_moves[shift:] + valid_moves[:shift]
+        return valid_moves
+    def pvs(self, game, depth, alpha, beta, maximizing_player, player):
+        """
+        Principal Variation Search in negamax form.
+
+        Scores are from the view of the side to move (player when
+        maximizing_player, else the opponent), so pvs(..., True, player)
+        returns the same (score, col) as minimax_ab. The first move gets
+        the full window, later moves a null window around alpha, and only a
+        move that fails high inside (alpha, beta) is searched again, from
+        its null-window score up to beta.
+        """
+        self.nodes_searched += 1
+        if self._deadline is not None:
+            self._check_time()
+        sign = 1 if maximizing_player else -1
+        if depth == 0 or game.get_game_state() != 0:
+            return sign * game.evaluate_position(player), None
+
+        valid_moves = game.get_valid_moves()
+        if not valid_moves:
+            return sign * game.evaluate_position(player), None
+        key = None
+        pv_move = self._root_pv_move if depth == self._root_depth else None
+        if self.tt is not None:
+            key = game.hash ^ _SEARCH_KEYS[player][maximizing_player]
+            entry = self.tt.lookup(key)
+            if entry is not None:
+                _, entry_depth, score, flag, move = entry
+                if entry_depth >= depth and (flag == EXACT or (flag == LOWER_BOUND and score >= beta)
+                                             or (flag == UPPER_BOUND and score <= alpha)):
+                    return score, move
+                if move is not None:
+                    pv_move = move
+        valid_moves = self._order_moves(game, valid_moves, depth, maximizing_player, player, pv_move)
+        mover = player if maximizing_player else 3 - player
+        original_alpha = alpha
+        best_score = -inf
+        best_col = valid_moves[0]
+        for i, col in enumerate(valid_moves):
+            undo_info = game.simulate_move(col, mover)
+            if i == 0:
+                score = -self.pvs(game, depth-1, -beta, -alpha, not maximizing_player, player)[0]
+            else:
+                # scores are integers, so (alpha, alpha + 1) is a null window
+                score = -self.pvs(game, depth-1, -alpha-1, -alpha, not maximizing_player, player)[0]
+                if alpha < score < beta:
+                    score = -self.pvs(game, depth-1, -beta, -score, not maximizing_player, player)[0]
+            game.undo_move(undo_info)
+
+            if score > best_score:
+                best_score = score
+                best_col = col
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                if self.move_ordering is not None:
+                    self.move_ordering.record_cutoff(col, self._root_depth - depth, mover, depth)
+                break
+        if key is not None:
+            if best_score <= original_alpha:
+                flag = UPPER_BOUND
+            elif best_score >= beta:
+                flag = LOWER_BOUND
+            else:
+                flag = EXACT
+            self.tt.store(key, depth, best_score, flag, best_col)
+        return best_score, best_col
+    def _minimax_ab_children(self, game, valid_moves, depth, alpha, beta, maximizing_player, player):
         if maximizing_player:
             best_score = -inf
             best_col = valid_moves[0] 
@@ -63,6 +642,8 @@ class MinimaxPlayer:
                 
                 alpha = max(alpha, best_score)
                 if beta <= alpha:
+                    if self.move_ordering is not None:
+                        self.move_ordering.record_cutoff(col, self._root_depth - depth, player, depth)
                     break 
             return best_score, best_col 
         else:
@@ -77,6 +658,8 @@ class MinimaxPlayer:
                     best_col = col
                 beta = min(beta, best_score)
                 if beta <= alpha:
+                    if self.move_ordering is not None:
+                        self.move_ordering.record_cutoff(col, self._root_depth - depth, 3-player, depth)
                     break 
             return best_score, best_col 
             
@@ -20,6 +20,12 @@ def run_test_file(filename, description):
         elif filename == "test_mcts_integration.py":
             import test_mcts_integration
             test_mcts_integration.run_integration_tests()
+        elif filename == "test_connect4.py":
+            import test_connect4
+            test_connect4.run_connect4_tests()
+        elif filename == "test_minimax.py":
+            import test_minimax
+            test_minimax.run_minimax_tests()
         
         print(f"✅ {description} PASSED")
         return True
@@ -36,7 +42,9 @@ def main():
     
     tests = [
         ("test_mcts_unit.py", "Unit Tests - Individual Components"),
-        ("test_mcts_integration.py", "Integration Tests - Algorithm Behavior")
+        ("test_mcts_integration.py", "Integration Tests - Algorithm Behavior"),
+        ("test_connect4.py", "State Engine Tests - Board Representations"),
+        ("test_minimax.py", "Minimax Tests - Search Enhancements")
     ]
     
     passed = 0
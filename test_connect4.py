@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Connect4 State Engine Tests
+Checks that the alternative state representations agree with Connect4
+"""
+
+import random
+import numpy as np
+from connect4 import Connect4, evaluate_boards, get_game_states
+from bitboard import BitboardConnect4
+from minimax import MinimaxPlayer
+from mcts import MCTSPlayer
+
+def random_games(num_games=50, seed=0):
+    """Yield lists of (col, player) moves for random complete games"""
+    rng = random.Random(seed)
+    for _ in range(num_games):
+        game = Connect4()
+        moves = []
+        player = 1
+        while game.get_game_state() == 0:
+            col = rng.choice(game.get_valid_moves())
+            game.simulate_move(col, player)
+            moves.append((col, player))
+            player = 3 - player
+        yield moves
+
+def test_bitboard_matches_connect4():
+    """Test that BitboardConnect4 agrees with Connect4 move by move"""
+    print("=== Testing Bitboard Equivalence ===")
+
+    for moves in random_games():
+        game = Connect4()
+        bb = BitboardConnect4()
+        for col, player in moves:
+            assert bb.simulate_move(col, player) == game.simulate_move(col, player), "Undo info should match"
+            assert (bb.board == game.board).all(), "Boards should match"
+            assert bb.get_valid_moves() == game.get_valid_moves(), "Valid moves should match"
+            assert bb.get_game_state() == game.get_game_state(), "Game states should match"
+            for p in (1, 2):
+                assert bb.evaluate_position(p) == game.evaluate_position(p), "Evaluations should match"
+
+    print("✓ Bitboard equivalence passed!")
+
+def test_bitboard_undo():
+    """Test that undo restores the exact bitboard state"""
+    print("=== Testing Bitboard Undo ===")
+
+    game = BitboardConnect4()
+    for col, player in [(3, 1), (3, 2), (4, 1), (2, 2)]:
+        game.simulate_move(col, player)
+    before = (game.bitboards[:], game.heights[:])
+
+    undo_info = game.simulate_move(3, 1)
+    assert undo_info == (3, 3), f"Undo info should be (row, col), got {undo_info}"
+    game.undo_move(undo_info)
+    assert (game.bitboards, game.heights) == before, "Undo should restore the position"
+
+    # is_winning_move only looks at lines through the given cell, like Connect4
+    for moves in random_games(num_games=20, seed=6):
+        game = Connect4()
+        bb = BitboardConnect4()
+        for col, player in moves:
+            row, _ = game.simulate_move(col, player)
+            bb.simulate_move(col, player)
+            game.current_player = bb.current_player = player
+            assert bb.is_winning_move(row, col) == game.is_winning_move(row, col), "Winning move checks should match"
+    won = BitboardConnect4()
+    for col, player in [(0, 1), (6, 2), (1, 1), (6, 2), (2, 1), (5, 2), (3, 1)]:
+        won.simulate_move(col, player)
+    won.current_player = 1
+    assert won.is_winning_move(5, 3), "Bottom row four should be found through its last cell"
+    assert not won.is_winning_move(4, 6), "A cell off the line should not report the win"
+
+    converted = BitboardConnect4.from_connect4(Connect4())
+    assert converted.get_valid_moves() == list(range(7)), "Empty board should convert"
+
+    print("✓ Bitboard undo passed!")
+
+def test_players_on_bitboard():
+    """Test that both players run unchanged on the bitboard adapter"""
+    print("=== Testing Players on Bitboard ===")
+
+    game = Connect4()
+    bb = BitboardConnect4()
+    for col, player in [(3, 1), (3, 2), (2, 1)]:
+        game.simulate_move(col, player)
+        bb.simulate_move(col, player)
+
+    minimax = MinimaxPlayer(depth=4)
+    assert minimax.get_best_move(bb, 2) == minimax.get_best_move(game, 2), "Minimax should pick the same move"
+
+    move = MCTSPlayer(simulations=100).get_move(bb, 2)
+    assert move in bb.get_valid_moves(), "MCTS should pick a valid move"
+
+    print("✓ Players on bitboard passed!")
+
+def test_game_state_cache():
+    """Test that the cached game state tracks moves and undos"""
+    print("=== Testing Game State Cache ===")
+
+    for moves in random_games(num_games=30, seed=1):
+        game = Connect4()
+        history = []
+        for col, player in moves:
+            history.append(game.simulate_move(col, player))
+            assert game.get_game_state() == game._scan_game_state(), "Cache should match a full scan"
+        assert game.get_game_state() != 0, "Finished game should be terminal"
+        while history:
+            game.undo_move(history.pop())
+            assert game.get_game_state() == game._scan_game_state(), "Undo should restore the cached state"
+
+    # a win along the edge diagonal, played with drop_piece like game.py
+    game = Connect4()
+    for col, player in [(3, 1), (2, 2), (2, 1), (1, 2), (0, 1), (1, 2), (1, 1), (0, 2), (0, 1), (6, 2), (0, 1)]:
+        game.current_player = player
+        row = game.get_next_open_row(col)
+        game.drop_piece(row, col)
+    assert game.is_winning_move(row, col), "Edge diagonal win should be detected"
+    assert game.get_game_state() == 1, "Player 1 should have won"
+
+    print("✓ Game state cache passed!")
+
+def test_incremental_evaluation():
+    """Test that the incremental evaluator matches a full rescan"""
+    print("=== Testing Incremental Evaluation ===")
+
+    for moves in random_games(num_games=30, seed=2):
+        game = Connect4()
+        game.evaluate_position(1)  # start tracking from the empty board
+        history = []
+        for col, player in moves:
+            history.append(game.simulate_move(col, player))
+            for p in (1, 2):
+                assert game.evaluate_position(p) == game._scan_evaluate_position(p), "Incremental score should match"
+        while history:
+            game.undo_move(history.pop())
+            for p in (1, 2):
+                assert game.evaluate_position(p) == game._scan_evaluate_position(p), "Undo should restore the score"
+
+    print("✓ Incremental evaluation passed!")
+
+def test_window_tables():
+    """Test the shared window tables on standard and odd board sizes"""
+    print("=== Testing Window Tables ===")
+
+    assert Connect4()._tables is Connect4()._tables, "Boards of one size should share tables"
+    tables = Connect4()._tables
+    assert len(tables.lines) == 69, f"6x7 board has 69 lines, got {len(tables.lines)}"
+    assert len(tables.windows) == 57, f"Evaluation scores 57 windows, got {len(tables.windows)}"
+
+    rng = random.Random(3)
+    for rows, cols in [(5, 8), (7, 9), (4, 4)]:
+        for _ in range(20):
+            game = Connect4(rows, cols)
+            bb = BitboardConnect4(rows, cols)
+            player = 1
+            while game.get_game_state() == 0:
+                col = rng.choice(game.get_valid_moves())
+                game.simulate_move(col, player)
+                bb.simulate_move(col, player)
+                player = 3 - player
+                assert game.get_game_state() == bb.get_game_state(), f"{rows}x{cols} game states should match"
+                assert game._scan_game_state() == bb.get_game_state(), f"{rows}x{cols} full scan should match"
+                for p in (1, 2):
+                    assert game.evaluate_position(p) == bb.evaluate_position(p), f"{rows}x{cols} scores should match"
+
+    print("✓ Window tables passed!")
+
+def test_vectorized_evaluation():
+    """Test that the NumPy evaluation returns the same scores"""
+    print("=== Testing Vectorized Evaluation ===")
+
+    for moves in random_games(num_games=20, seed=4):
+        game = Connect4()
+        for col, player in moves:
+            game.simulate_move(col, player)
+            for p in (1, 2):
+                assert game.evaluate_position_vectorized(p) == game._scan_evaluate_position(p), "Vectorized score should match"
+
+    print("✓ Vectorized evaluation passed!")
+
+def test_batch_evaluation():
+    """Test scoring a stack of positions in one call"""
+    print("=== Testing Batch Evaluation ===")
+
+    games = []
+    for moves in random_games(num_games=20, seed=5):
+        game = Connect4()
+        for col, player in moves:
+            game.simulate_move(col, player)
+            games.append(game.copy_game())
+    boards = np.stack([game.board for game in games])
+
+    for p in (1, 2):
+        scores, states = evaluate_boards(boards, p)
+        assert scores.shape == (len(games),), "Should return one score per board"
+        assert list(scores) == [game._scan_evaluate_position(p) for game in games], "Batch scores should match"
+        assert list(states) == [game._scan_game_state() for game in games], "Batch states should match"
+
+    bitboards = [BitboardConnect4.from_connect4(game) for game in games[:10]]
+    assert list(get_game_states(bitboards)) == list(get_game_states(boards[:10])), "Bitboard games should batch too"
+
+    print("✓ Batch evaluation passed!")
+
+def test_zobrist_hash():
+    """Test incremental Zobrist hashing and the mirror hash"""
+    print("=== Testing Zobrist Hash ===")
+
+    # the same position reached through different move orders
+    first = Connect4()
+    second = Connect4()
+    for col, player in [(3, 1), (2, 2), (4, 1), (2, 2)]:
+        first.simulate_move(col, player)
+    for col, player in [(4, 1), (2, 2), (3, 1), (2, 2)]:
+        second.simulate_move(col, player)
+    assert first.hash == second.hash, "Transposed positions should hash equally"
+    assert first.hash != 0 and first.hash < 2**64, "Hash should be a nonzero 64-bit value"
+
+    # mirror hash equals the hash of the reflected position
+    reflected = Connect4()
+    for col, player in [(3, 1), (4, 2), (2, 1), (4, 2)]:
+        reflected.simulate_move(col, player)
+    assert first.mirror_hash == reflected.hash, "Mirror hash should match the reflected board"
+    assert reflected.mirror_hash == first.hash, "Reflection should be symmetric"
+
+    # undo, drop_piece, copy and the bitboard adapter all agree
+    bb = BitboardConnect4()
+    for col, player in [(3, 1), (2, 2), (4, 1), (2, 2)]:
+        bb.simulate_move(col, player)
+    assert bb.hash == first.hash and bb.mirror_hash == first.mirror_hash, "Bitboard hashes should match"
+    undo_info = first.simulate_move(0, 1)
+    bb.undo_move(bb.simulate_move(0, 1))
+    first.undo_move(undo_info)
+    assert first.hash == second.hash == bb.hash, "Undo should restore the hash"
+    assert first.copy_game().hash == first.hash, "Copies should keep the hash"
+
+    dropped = Connect4()
+    for col, player in [(3, 1), (2, 2), (4, 1), (2, 2)]:
+        dropped.current_player = player
+        dropped.drop_piece(dropped.get_next_open_row(col), col)
+    assert dropped.hash == first.hash, "drop_piece should update the hash"
+
+    print("✓ Zobrist hash passed!")
+
+def run_connect4_tests():
+    print("Running Connect4 State Engine Tests...")
+
+    test_bitboard_matches_connect4()
+    test_bitboard_undo()
+    test_players_on_bitboard()
+    test_game_state_cache()
+    test_incremental_evaluation()
+    test_window_tables()
+    test_vectorized_evaluation()
+    test_batch_evaluation()
+    test_zobrist_hash()
+
+    print("\n🎉 All state engine tests passed!")
+
+if __name__ == "__main__":
+    run_connect4_tests()
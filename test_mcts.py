@@ -17,7 +17,7 @@ def test_mcts_basic():
     assert move in game.get_valid_moves(), "MCTS chose invalid move!"
     
     # Make the move and test again
-    game.drop_piece(move, 1)
+    game.drop_piece(game.get_next_open_row(move), move)
     move2 = mcts_player.get_move(game, 2)
     print(f"MCTS chose second move: {move2}")
     assert move2 in game.get_valid_moves(), "MCTS chose invalid second move!"
@@ -8,7 +8,8 @@ import time
 import random
 from collections import Counter
 from connect4 import Connect4
-from mcts import MCTSPlayer
+from bitboard import BitboardConnect4
+from mcts import MCTSPlayer, RootParallelMCTSPlayer, TreeParallelMCTSPlayer, Node
 from minimax import MinimaxPlayer
 
 def test_mcts_move_validity():
@@ -151,6 +152,226 @@ def test_mcts_vs_random():
     assert win_rate >= 60, f"MCTS should beat random player >60% of time, got {win_rate}%"
     print("✓ MCTS beats random player!")
 
+def test_mcts_tree_reuse():
+    """Test that MCTS continues from the subtree of the position reached"""
+    print("=== Testing Tree Reuse ===")
+    
+    game = Connect4()
+    mcts = MCTSPlayer(simulations=400, reuse_tree=True)
+    
+    move = mcts.get_move(game, 1)
+    assert mcts.reused_visits == 0, "First search starts from scratch"
+    game.simulate_move(move, 1)
+    game.simulate_move(3, 2)
+    
+    move = mcts.get_move(game, 1)
+    print(f"  Visits carried over after two plies: {mcts.reused_visits}")
+    assert mcts.reused_visits > 0, "Second search should reuse the subtree"
+    assert move in game.get_valid_moves(), "Reused tree should still pick a valid move"
+    
+    # an unrelated position falls back to a fresh tree
+    mcts.get_move(Connect4(), 1)
+    assert mcts.reused_visits == 0, "Unrelated position should not reuse the tree"
+    
+    print("✓ Tree reuse works!")
+
+def test_root_parallel_mcts():
+    """Test root-parallel MCTS across worker processes"""
+    print("=== Testing Root-Parallel MCTS ===")
+    
+    game = Connect4()
+    game.simulate_move(0, 1)
+    game.simulate_move(1, 1)
+    game.simulate_move(2, 1)
+    
+    mcts = RootParallelMCTSPlayer(simulations=200, workers=2)
+    try:
+        move = mcts.get_move(game, 1)
+        print(f"  Merged visit counts: {mcts.visit_counts}")
+        assert sum(mcts.visit_counts.values()) == 400, "Visit counts from both workers should be merged"
+        assert move == 3, f"Root-parallel MCTS should find the winning move, got {move}"
+    finally:
+        mcts.close()
+    
+    print("✓ Root-parallel MCTS works!")
+
+def test_tree_parallel_mcts():
+    """Test tree-parallel MCTS with virtual loss"""
+    print("=== Testing Tree-Parallel MCTS ===")
+    
+    game = Connect4()
+    game.simulate_move(0, 1)
+    game.simulate_move(1, 1)
+    game.simulate_move(2, 1)
+    
+    mcts = TreeParallelMCTSPlayer(simulations=300, workers=2, virtual_loss=1.0)
+    try:
+        root = mcts.search(game, 1)
+        assert root.visits == 300, "Every simulation should be backpropagated once"
+        assert root.virtual_loss == 0, "Virtual loss should be removed after each round"
+        assert all(child.virtual_loss == 0 for child in root.children), "No virtual loss should remain"
+        move = mcts.get_move(game, 1)
+        assert move == 3, f"Tree-parallel MCTS should find the winning move, got {move}"
+    finally:
+        mcts.close()
+    
+    # a virtual loss weight below one leaves the root with under one visit early on
+    mcts = TreeParallelMCTSPlayer(simulations=100, workers=2, virtual_loss=0.1)
+    try:
+        root = mcts.search(Connect4(), 1)
+        assert root.visits == 100, "Fractional virtual loss should not stop the search"
+        assert abs(root.virtual_loss) < 1e-9, "Fractional virtual loss should be removed again"
+    finally:
+        mcts.close()
+    
+    print("✓ Tree-parallel MCTS works!")
+
+def test_mcts_time_budget():
+    """Test that time-budgeted MCTS respects its deadline"""
+    print("=== Testing Time Budget ===")
+    
+    game = Connect4()
+    for budget in [0.1, 0.3]:
+        mcts = MCTSPlayer(time_limit=budget)
+        start = time.time()
+        move = mcts.get_move(game, 1)
+        elapsed = time.time() - start
+        print(f"  {budget}s budget: {mcts.simulations_run} simulations in {elapsed:.3f}s")
+        assert move in game.get_valid_moves(), "Timed MCTS should pick a valid move"
+        assert mcts.simulations_run > 0, "At least one simulation should run"
+        assert elapsed < budget + 0.1, f"Search overran its {budget}s budget: {elapsed:.3f}s"
+    
+    mcts = MCTSPlayer(simulations=50)
+    mcts.get_move(game, 1)
+    assert mcts.simulations_run == 50, "Fixed budget should run exactly its simulations"
+    
+    print("✓ Time budget respected!")
+
+def test_mcts_early_stop():
+    """Test that MCTS stops once the best move is decided"""
+    print("=== Testing Early Stop ===")
+    
+    game = Connect4()
+    game.simulate_move(0, 1)
+    game.simulate_move(1, 1)
+    game.simulate_move(2, 1)
+    
+    mcts = MCTSPlayer(simulations=2000, early_stop=True)
+    move = mcts.get_move(game, 1)
+    print(f"  Winning move {move} decided after {mcts.simulations_run}/2000 simulations")
+    assert move == 3, f"Early stop should keep the winning move, got {move}"
+    assert mcts.simulations_run < 2000, "Obvious position should stop early"
+    
+    # a single legal move needs no search beyond expanding it
+    forced = Connect4()
+    for col in range(6):
+        for height in range(6):
+            forced.simulate_move(col, 1 + (height + col // 2) % 2)
+    mcts.get_move(forced, 1)
+    assert mcts.simulations_run == 1, f"Forced move should stop at once, ran {mcts.simulations_run}"
+    
+    # with a time budget the clock is still read only every few simulations
+    clock_reads = 0
+    perf_counter = time.perf_counter
+    def counting_clock():
+        nonlocal clock_reads
+        clock_reads += 1
+        return perf_counter()
+    timed = MCTSPlayer(time_limit=0.2, early_stop=True)
+    time.perf_counter = counting_clock
+    try:
+        timed.get_move(Connect4(), 1)
+    finally:
+        time.perf_counter = perf_counter
+    print(f"  {clock_reads} clock reads for {timed.simulations_run} timed simulations")
+    assert clock_reads <= timed.simulations_run // 8 + 2, "Early stop should not read the clock per simulation"
+    
+    print("✓ Early stop works!")
+
+def test_mcts_solver():
+    """Test that MCTS-Solver proves wins and losses"""
+    print("=== Testing MCTS-Solver ===")
+    
+    game = Connect4()
+    game.simulate_move(0, 1)
+    game.simulate_move(1, 1)
+    game.simulate_move(2, 1)
+    
+    mcts = MCTSPlayer(simulations=2000, solver=True)
+    root = mcts.search(game, 1)
+    print(f"  Immediate win proven after {mcts.simulations_run} simulations")
+    assert root.proven == 0, "Root should be proven lost for the player who just moved"
+    assert mcts.simulations_run < 50, "Search should stop once the root is solved"
+    assert mcts.get_move(game, 1) == 3, "Solver should play the proven win"
+    
+    # bottom row: . 2 2 2 . 1 1 -- player 1 cannot stop both threats
+    lost = Connect4()
+    for col, player in [(1, 2), (2, 2), (3, 2), (5, 1), (6, 1), (6, 1)]:
+        lost.simulate_move(col, player)
+    root = MCTSPlayer(simulations=3000, solver=True).search(lost, 1)
+    assert root.proven == 1, "Double threat should be proven won for player 2"
+    assert all(child.proven == 0 for child in root.children), "Every player 1 move should be proven lost"
+    
+    # a selected node whose children were all solved elsewhere is solved itself
+    mcts = MCTSPlayer(solver=True)
+    node = Node(Connect4(), player_who_moved=2)
+    while node.expand_node():
+        pass
+    for child in node.children:
+        child.proven = 0
+    mcts._propagate_proven([node])
+    assert node.proven == 1, "Node with only proven-lost children should be proven won"
+    
+    print("✓ MCTS-Solver works!")
+
+def test_mcts_transpositions():
+    """Test that transposition mode shares nodes between move orders"""
+    print("=== Testing Transposition DAG ===")
+    
+    game = Connect4()
+    mcts = MCTSPlayer(simulations=1500, transpositions=True)
+    root = mcts.search(game, 1)
+    assert root.visits == 1500, f"Root should get every simulation, got {root.visits}"
+    shared = [node for node in mcts._table.values() if node.transposed_moves]
+    print(f"  {len(mcts._table)} positions, {len(shared)} with transposed children")
+    assert shared, "Some positions should be reached by several move orders"
+    
+    # every edge, including transposed ones, leads to the child's position
+    stack = [(root, game.copy_game())]
+    while stack:
+        node, state = stack.pop()
+        for child in node.children:
+            after = state.copy_game()
+            after.simulate_move(node.move_to(child), child.player_who_moved)
+            assert after.hash == child.game_state.hash, "Edge should lead to the child position"
+            if child.parent is node:
+                stack.append((child, after))
+    
+    move = MCTSPlayer(simulations=300, transpositions=True, rave=True, solver=True).get_move(game, 1)
+    assert move in game.get_valid_moves(), "DAG search should pick a valid move"
+    
+    # reused roots can have children first created under another parent
+    random.seed(3)
+    for game_class in (Connect4, BitboardConnect4):
+        game = game_class()
+        players = {1: MCTSPlayer(simulations=200, reuse_tree=True, transpositions=True),
+                   2: MCTSPlayer(simulations=200, reuse_tree=True, transpositions=True)}
+        player = 1
+        while game.get_game_state() == 0:
+            move = players[player].get_move(game, player)
+            assert move in game.get_valid_moves(), f"Reused DAG search played illegal column {move}"
+            # the table keeps only the new root's subtree, with parent chains inside it
+            root = players[player]._root
+            for (position_hash, _), node in players[player]._table.items():
+                assert node.game_state.hash == position_hash, "Table node should replay to its position"
+                while node.parent is not None:
+                    node = node.parent
+                assert node is root, "Table nodes should chain up to the current root"
+            game.simulate_move(move, player)
+            player = 3 - player
+    
+    print("✓ Transposition DAG works!")
+
 def run_integration_tests():
     print("Running MCTS Integration Tests...")
     
@@ -159,6 +380,13 @@ def run_integration_tests():
     test_mcts_exploration()
     test_mcts_winning_positions()
     test_mcts_vs_random()
+    test_mcts_tree_reuse()
+    test_root_parallel_mcts()
+    test_tree_parallel_mcts()
+    test_mcts_time_budget()
+    test_mcts_early_stop()
+    test_mcts_solver()
+    test_mcts_transpositions()
     
     print("\n🎉 All integration tests passed!")
 
@@ -7,7 +7,7 @@ Tests individual components and overall algorithm performance
 import time
 import random
 from connect4 import Connect4
-from mcts import MCTSPlayer, Node
+from mcts import MCTSPlayer, ArrayMCTSPlayer, Node, batch_rollout, random_rollout
 from minimax import MinimaxPlayer
 
 def test_node_basics():
@@ -140,10 +140,132 @@ def test_backpropagation():
     
     print("✓ Backpropagation passed!")
 
+def test_array_tree():
+    """Test the array-backed tree statistics"""
+    print("=== Testing Array Tree ===")
+    
+    game = Connect4()
+    player = ArrayMCTSPlayer(simulations=300)
+    move = player.get_move(game, 1)
+    assert move in game.get_valid_moves(), "Array MCTS chose invalid move!"
+    
+    root_children = range(player.first_child[0], player.first_child[0] + player.num_children[0])
+    assert player.visits[0] == 300, "Root should be visited once per simulation"
+    assert sum(player.visits[c] for c in root_children) == 300, "Every simulation should pass a root child"
+    assert all(player.parent[c] == 0 and player.player[c] == 1 for c in root_children), "Root children link back"
+    for node in range(1, player.size):
+        assert player.visits[node] <= player.visits[player.parent[node]], "Child visits exceed parent"
+    assert (game.board == 0).all(), "Search should not modify the game"
+    
+    # with the same seed the array tree makes the same choices as the Node tree
+    game.simulate_move(3, 1)
+    random.seed(5)
+    root = MCTSPlayer(simulations=300).search(game, 2)
+    random.seed(5)
+    player.get_move(game, 2)
+    root_children = range(player.first_child[0], player.first_child[0] + player.expanded[0])
+    assert ({player.move[c]: player.visits[c] for c in root_children}
+            == {child.move: child.visits for child in root.children}), "Visit counts should match MCTSPlayer"
+    
+    print(f"  Nodes used: {player.size}")
+    print("✓ Array tree passed!")
+
+def test_nodes_share_state():
+    """Test that only the root stores a board and children replay moves"""
+    print("=== Testing Node State Reconstruction ===")
+    
+    game = Connect4()
+    root = Node(game, player_who_moved=2)
+    child = root.expand_node()
+    grandchild = child.expand_node()
+    
+    assert root.root_state is not None, "Root should keep its own board"
+    assert child.root_state is None and grandchild.root_state is None, "Children should not store boards"
+    
+    expected = Connect4()
+    expected.simulate_move(child.move, 1)
+    expected.simulate_move(grandchild.move, 2)
+    assert (grandchild.game_state.board == expected.board).all(), "Replayed state should match the path"
+    
+    # expansion and simulation with a scratch board leave it unchanged
+    scratch = child.game_state
+    before = scratch.board.copy()
+    child.expand_node(scratch)
+    child.simulate(scratch)
+    assert (scratch.board == before).all(), "Scratch board should be restored"
+    
+    print("✓ Node state reconstruction passed!")
+
+def test_batch_rollout():
+    """Test vectorized batch rollouts and count backpropagation"""
+    print("=== Testing Batch Rollouts ===")
+    
+    game = Connect4()
+    outcomes = batch_rollout(game, 1, 200)
+    assert outcomes.sum() == 200 and outcomes[0] == 0, f"Every rollout should finish: {outcomes}"
+    assert outcomes[1] > 0 and outcomes[2] > 0, "Random games should be won by both players"
+    
+    # one empty cell left: every rollout plays the same game
+    endgame = Connect4()
+    for col in range(7):
+        for height in range(6 if col < 6 else 5):
+            endgame.simulate_move(col, 1 + (height + col // 2) % 2)
+    assert endgame.get_game_state() == 0, "Pattern board should still be open"
+    player = 2
+    expected = random_rollout(endgame, player)
+    outcomes = batch_rollout(endgame, player, 10)
+    assert outcomes[expected] == 10, f"Forced line should always end in {expected}: {outcomes}"
+    
+    random.seed(11)
+    first = batch_rollout(game, 1, 50)
+    random.seed(11)
+    assert (batch_rollout(game, 1, 50) == first).all(), "random.seed should make batch rollouts reproducible"
+    
+    root = MCTSPlayer(simulations=20, rollouts_per_leaf=8).search(Connect4(), 1)
+    assert root.visits == 160, "Each descent should add one visit per rollout"
+    assert sum(child.visits for child in root.children) == 160, "Children should share the rollouts"
+    
+    print("✓ Batch rollouts passed!")
+
+def test_rave_statistics():
+    """Test that RAVE credits moves played later in the simulation"""
+    print("=== Testing RAVE Statistics ===")
+    
+    game = Connect4()
+    root = Node(game, player_who_moved=2)
+    while not root.is_fully_expanded():
+        root.expand_node()
+    by_move = {child.move: child for child in root.children}
+    
+    assert by_move[3].cell == (5, 3), "Children should remember the cell they fill"
+    
+    # player 1 later filled the bottom of column 3 and won; column 4 only by player 2
+    root.update_rave({((5, 3), 1), ((5, 4), 2), ((4, 5), 1), ((5, 6), 1)}, 1)
+    assert by_move[3].rave_visits == 1 and by_move[3].rave_wins == 1, "Cell (5, 3) should be credited with the win"
+    assert by_move[6].rave_wins == 1, "Every move of the player should be credited"
+    assert by_move[4].rave_visits == 0, "Opponent moves should not count"
+    assert by_move[5].rave_visits == 0, "A different cell in the same column should not count"
+    
+    # blending only moves the score while the node has few visits of its own
+    child = by_move[3]
+    root.visits = child.visits = 1
+    assert child.ucb1_score(rave_k=300) > child.ucb1_score(), "RAVE win should raise the score"
+    child.visits, child.wins, root.visits = 10000, 0, 10000
+    assert abs(child.ucb1_score(rave_k=300) - child.ucb1_score()) < 0.15, "RAVE weight should fade with visits"
+    
+    root = MCTSPlayer(simulations=50, rave=True).search(Connect4(), 1)
+    assert sum(child.rave_visits for child in root.children) >= root.visits, "Rollouts should feed RAVE stats"
+    
+    print("✓ RAVE statistics passed!")
+
 print("Running MCTS Unit Tests...")
 test_node_basics()
 test_node_expansion()
 test_ucb1_calculation()
 test_simulation_consistency()
 test_backpropagation()
+test_array_tree()
+test_nodes_share_state()
+test_batch_rollout()
+test_rave_statistics()
 print("\n🎉 All unit tests passed!")
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Minimax Search Tests
+Checks that the search enhancements keep minimax values and save work
+"""
+
+import pickle
+import random
+import time
+from math import inf
+from connect4 import Connect4
+from minimax import (MinimaxPlayer, MoveOrdering, TranspositionTable, SharedTranspositionTable,
+                     EXACT, LOWER_BOUND, UPPER_BOUND)
+
+def sample_positions(num_positions=8, seed=0):
+    """Build (game, player_to_move) pairs from short random openings"""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < num_positions:
+        game = Connect4()
+        player = 1
+        for _ in range(rng.randint(2, 12)):
+            game.simulate_move(rng.choice(game.get_valid_moves()), player)
+            player = 3 - player
+            if game.get_game_state() != 0:
+                break
+        if game.get_game_state() == 0:
+            positions.append((game, player))
+    return positions
+
+def search_value(minimax, game, player):
+    """Root minimax value and nodes searched with the given player"""
+    minimax.nodes_searched = 0
+    score, _ = minimax.minimax_ab(game, minimax.depth, -inf, inf, True, player)
+    return score, minimax.nodes_searched
+
+def test_transposition_table():
+    """Test that the transposition table keeps values and cuts nodes"""
+    print("=== Testing Transposition Table ===")
+
+    plain_nodes = tt_nodes = 0
+    for game, player in sample_positions():
+        plain_score, nodes = search_value(MinimaxPlayer(depth=5), game, player)
+        plain_nodes += nodes
+        tt_score, nodes = search_value(MinimaxPlayer(depth=5, tt_size=1 << 16), game, player)
+        tt_nodes += nodes
+        assert tt_score == plain_score, f"TT changed the value: {tt_score} vs {plain_score}"
+
+    print(f"  Nodes without TT: {plain_nodes}, with TT: {tt_nodes}")
+    assert tt_nodes < plain_nodes, "Transposition table should reduce nodes searched"
+
+    table = TranspositionTable(size=4)
+    table.store(1, 5, 10, EXACT, 3)
+    table.store(5, 2, 20, LOWER_BOUND, 1)  # same slot, shallower: kept out
+    assert table.lookup(1) == (1, 5, 10, EXACT, 3), "Depth-preferred slot should keep the deeper entry"
+    assert table.lookup(5) is None, "Shallower entry should not replace a deeper one"
+    table = TranspositionTable(size=4, replacement='always')
+    table.store(1, 5, 10, EXACT, 3)
+    table.store(5, 2, 20, LOWER_BOUND, 1)
+    assert table.lookup(5) == (5, 2, 20, LOWER_BOUND, 1), "Always-replace should keep the newest entry"
+
+    print("✓ Transposition table passed!")
+
+def test_iterative_deepening():
+    """Test that a time budget bounds latency and reports the depth reached"""
+    print("=== Testing Iterative Deepening ===")
+
+    game, player = sample_positions(num_positions=1, seed=1)[0]
+    minimax = MinimaxPlayer(time_limit=0.3, tt_size=1 << 16)
+    board_before = game.board.copy()
+
+    start = time.perf_counter()
+    move = minimax.get_best_move(game, player)
+    elapsed = time.perf_counter() - start
+
+    print(f"  Move {move} at depth {minimax.depth_reached} in {elapsed:.3f}s")
+    assert move in game.get_valid_moves(), "Timed search should return a valid move"
+    assert minimax.depth_reached >= 1, "At least one iteration should complete"
+    assert elapsed < 1.0, f"Search should respect its budget, took {elapsed:.3f}s"
+    assert (game.board == board_before).all(), "Interrupted search should not touch the game"
+
+    # deepening stops at the number of empty cells on a nearly full board
+    rng = random.Random(2)
+    endgame = Connect4()
+    while int((endgame.board == 0).sum()) > 6 or endgame.get_game_state() != 0:
+        if endgame.get_game_state() != 0:
+            endgame = Connect4()
+        moves_played = int((endgame.board != 0).sum())
+        endgame.simulate_move(rng.choice(endgame.get_valid_moves()), 1 + moves_played % 2)
+    timed = MinimaxPlayer(time_limit=5.0)
+    start = time.perf_counter()
+    timed.get_best_move(endgame, 1)
+    assert timed.depth_reached == 6, f"Should stop at 6 empty cells, reached {timed.depth_reached}"
+    assert time.perf_counter() - start < 5.0, "Solved endgame should return early"
+
+    print("✓ Iterative deepening passed!")
+
+def test_move_ordering():
+    """Test that move ordering keeps values and prunes more"""
+    print("=== Testing Move Ordering ===")
+
+    plain_nodes = ordered_nodes = 0
+    for game, player in sample_positions(seed=3):
+        plain_score, nodes = search_value(MinimaxPlayer(depth=5), game, player)
+        plain_nodes += nodes
+        ordered_score, nodes = search_value(MinimaxPlayer(depth=5, move_ordering=True), game, player)
+        ordered_nodes += nodes
+        assert ordered_score == plain_score, f"Ordering changed the value: {ordered_score} vs {plain_score}"
+
+    print(f"  Nodes left-to-right: {plain_nodes}, ordered: {ordered_nodes}")
+    assert ordered_nodes < plain_nodes, "Move ordering should reduce nodes searched"
+
+    game = Connect4()
+    ordering = MoveOrdering(killers=False, history=False, pv=False)
+    assert ordering.order(game, list(range(7)), 0, 1) == [3, 2, 4, 1, 5, 0, 6], "Center columns should come first"
+    ordering = MoveOrdering()
+    ordering.record_cutoff(6, 2, 1, 3)
+    assert ordering.order(game, list(range(7)), 2, 1, pv_move=0)[:2] == [0, 6], "PV then killer move should lead"
+    assert ordering.order(game, list(range(7)), 1, 1)[0] == 6, "History should promote cutoff moves"
+
+    print("✓ Move ordering passed!")
+
+def test_root_split():
+    """Test that splitting the root over worker processes keeps the value"""
+    print("=== Testing Root-Split Parallel Search ===")
+
+    sequential = MinimaxPlayer(depth=5, tt_size=1 << 16, move_ordering=True)
+    parallel = MinimaxPlayer(depth=5, tt_size=1 << 16, move_ordering=True, workers=2)
+    try:
+        for game, player in sample_positions(num_positions=4, seed=4):
+            score, _ = sequential._search(game, 5, player)
+            parallel_score, move = parallel._search(game, 5, player)
+            assert parallel_score == score, f"Root split changed the value: {parallel_score} vs {score}"
+            game.simulate_move(move, player)
+            move_score, _ = MinimaxPlayer().minimax_ab(game, 4, -inf, inf, False, player)
+            assert move_score == score, "Chosen move should achieve the root value"
+
+        timed = MinimaxPlayer(time_limit=0.3, tt_size=1 << 16, move_ordering=True, workers=2)
+        try:
+            move = timed.get_best_move(Connect4(), 1)
+            assert move in range(7) and timed.depth_reached >= 1, "Timed root split should return a move"
+        finally:
+            timed.close()
+    finally:
+        parallel.close()
+
+    print("✓ Root-split parallel search passed!")
+
+def test_lazy_smp():
+    """Test the shared-memory table and Lazy SMP helpers"""
+    print("=== Testing Lazy SMP ===")
+
+    table = SharedTranspositionTable(size=4)
+    try:
+        table.store(1, 5, -250, UPPER_BOUND, 6)
+        table.store(5, 2, 20, LOWER_BOUND, 1)  # same slot, shallower: kept out
+        table.store(2, 3, 1000, EXACT, None)
+        assert table.lookup(1) == (1, 5, -250, UPPER_BOUND, 6), "Entries should round-trip through shared memory"
+        assert table.lookup(5) is None, "Shallower entry should not replace a deeper one"
+        assert table.lookup(2) == (2, 3, 1000, EXACT, None), "Entries without a move should round-trip"
+        attached = pickle.loads(pickle.dumps(table))
+        attached.store(3, 1, 7, EXACT, 0)
+        assert table.lookup(3) == (3, 1, 7, EXACT, 0), "Unpickled table should share the same memory"
+        attached.close()
+    finally:
+        table.unlink()
+
+    # player 1 wins at once in column 3
+    game = Connect4()
+    for col, player in [(0, 1), (0, 2), (1, 1), (1, 2), (2, 1), (6, 2)]:
+        game.simulate_move(col, player)
+    minimax = MinimaxPlayer(depth=6, move_ordering=True, workers=2, parallel='lazy_smp')
+    try:
+        assert minimax.tt is None, "Shared table should only be created with the workers"
+        assert minimax.get_best_move(game, 1) == 3, "Lazy SMP should find the winning move"
+        assert minimax.depth_reached == 6, "Main search should deepen to the requested depth"
+        assert isinstance(minimax.tt, SharedTranspositionTable), "Lazy SMP should share one table"
+
+        # a closed player builds a fresh table on its next search
+        minimax.close()
+        assert minimax.get_best_move(game, 1) == 3, "Search after close should still work"
+        assert isinstance(minimax.tt, SharedTranspositionTable), "Search after close should share a new table"
+
+        timed = MinimaxPlayer(time_limit=0.3, tt_size=1 << 16, workers=2, parallel='lazy_smp')
+        try:
+            start = time.perf_counter()
+            move = timed.get_best_move(Connect4(), 1)
+            assert move in range(7) and time.perf_counter() - start < 1.5, "Timed Lazy SMP should return in time"
+        finally:
+            timed.close()
+    finally:
+        minimax.close()
+
+    print("✓ Lazy SMP passed!")
+
+def test_pvs():
+    """Test that Principal Variation Search keeps values and saves nodes"""
+    print("=== Testing Principal Variation Search ===")
+
+    ab_nodes = pvs_nodes = 0
+    for game, player in sample_positions(seed=5):
+        for options in ({}, {'tt_size': 1 << 16, 'move_ordering': True}):
+            alphabeta = MinimaxPlayer(depth=5, **options)
+            pvs = MinimaxPlayer(depth=5, search='pvs', **options)
+            ab_score, _ = alphabeta._search(game, 5, player)
+            pvs_score, _ = pvs._search(game, 5, player)
+            assert pvs_score == ab_score, f"PVS changed the value: {pvs_score} vs {ab_score}"
+            if options:
+                ab_nodes += alphabeta.nodes_searched
+                pvs_nodes += pvs.nodes_searched
+
+    print(f"  Nodes alpha-beta: {ab_nodes}, PVS: {pvs_nodes}")
+    assert pvs_nodes < ab_nodes, "PVS with move ordering should search fewer nodes"
+
+    timed = MinimaxPlayer(time_limit=0.2, tt_size=1 << 16, move_ordering=True, search='pvs')
+    assert timed.get_best_move(Connect4(), 1) in range(7), "Timed PVS should return a move"
+
+    print("✓ Principal Variation Search passed!")
+
+def test_mtdf():
+    """Test that MTD(f) converges on the alpha-beta value"""
+    print("=== Testing MTD(f) ===")
+
+    ab_nodes = mtdf_nodes = 0
+    for game, player in sample_positions(seed=6):
+        # the same iterative deepening MTD(f) runs under, with plain alpha-beta
+        alphabeta = MinimaxPlayer(depth=6, tt_size=1 << 16, move_ordering=True)
+        for depth in range(1, 7):
+            ab_score, alphabeta._root_pv_move = alphabeta._search(game, depth, player)
+        ab_nodes += alphabeta.nodes_searched
+
+        mtdf = MinimaxPlayer(depth=6, tt_size=1 << 16, move_ordering=True, search='mtdf')
+        move = mtdf.get_best_move(game, player)
+        mtdf_nodes += mtdf.nodes_searched
+        assert mtdf._mtdf_scores[6] == ab_score, f"MTD(f) changed the value: {mtdf._mtdf_scores[6]} vs {ab_score}"
+        assert mtdf.mtdf_passes >= 6, "Each iteration should take at least one pass"
+        game.simulate_move(move, player)
+        move_score, _ = MinimaxPlayer().minimax_ab(game, 5, -inf, inf, False, player)
+        assert move_score == ab_score, "Chosen move should achieve the root value"
+
+    print(f"  Nodes alpha-beta: {ab_nodes}, MTD(f): {mtdf_nodes}")
+    assert mtdf_nodes < ab_nodes, "MTD(f) should search fewer nodes"
+
+    assert MinimaxPlayer(search='mtdf').tt is not None, "MTD(f) should create a transposition table"
+    try:
+        MinimaxPlayer(search='mtdf', workers=2)
+        assert False, "Root split should reject MTD(f)"
+    except ValueError:
+        pass
+    timed = MinimaxPlayer(time_limit=0.2, move_ordering=True, search='mtdf')
+    assert timed.get_best_move(Connect4(), 1) in range(7), "Timed MTD(f) should return a move"
+
+    print("✓ MTD(f) passed!")
+
+def run_minimax_tests():
+    print("Running Minimax Search Tests...")
+
+    test_transposition_table()
+    test_iterative_deepening()
+    test_move_ordering()
+    test_root_split()
+    test_lazy_smp()
+    test_pvs()
+    test_mtdf()
+
+    print("\n🎉 All minimax tests passed!")
+
+if __name__ == "__main__":
+    run_minimax_tests()